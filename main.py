@@ -1,17 +1,1895 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 import threading
-import pyaudio
+import asyncio
+import queue
 import wave
-import tempfile
 import os
+import json
+import hashlib
+import sqlite3
+import math
+import struct
+import time
+import functools
+import multiprocessing
+from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from collections import OrderedDict
+from contextlib import contextmanager
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import datetime
-import whisper
+import numpy as np
+
+# Heavy modules (whisper pulls in torch) are imported lazily on background
+# threads so the window appears immediately; see import_pyaudio/import_whisper
+pyaudio = None
+whisper = None
+
+# PortAudio constants, stable across PyAudio releases, so the capture path does
+# not need pyaudio imported to be defined
+PA_INT16 = 8
+PA_CONTINUE = 0
+PA_INPUT_OVERFLOW = 2
+
+# Whisper models operate on 16 kHz mono float32 audio
+WHISPER_SAMPLE_RATE = 16000
+
+
+def import_pyaudio():
+    """Import PyAudio on first use"""
+    global pyaudio
+    if pyaudio is None:
+        import pyaudio as module
+        pyaudio = module
+    return pyaudio
+
+
+def import_whisper():
+    """Import Whisper (and torch) on first use"""
+    global whisper
+    if whisper is None:
+        import whisper as module
+        whisper = module
+    return whisper
+
+
+# Whisper model sizes offered in the UI
+WHISPER_MODEL_SIZES = ["tiny", "base", "small", "medium"]
+
+# Decoding profiles trading accuracy for speed; "balanced" matches the defaults of
+# whisper's transcribe() (one sample per fallback temperature, as before profiles)
+FALLBACK_TEMPERATURES = (0.0, 0.2, 0.4, 0.6, 0.8, 1.0)
+DECODING_PROFILES = {
+    # Greedy, no temperature fallback, no conditioning: fastest, for short commands
+    "realtime": {"beam_size": None, "best_of": None, "temperature": 0.0,
+                 "condition_on_previous_text": False, "fp16": True},
+    "balanced": {"beam_size": None, "best_of": None, "temperature": FALLBACK_TEMPERATURES,
+                 "condition_on_previous_text": True, "fp16": True},
+    # Beam search in full precision for recordings where accuracy matters most
+    "accurate": {"beam_size": 5, "best_of": 5, "temperature": FALLBACK_TEMPERATURES,
+                 "condition_on_previous_text": True, "fp16": False},
+}
+
+
+class StartupTimer:
+    """Collects how long each startup phase took for the timing report"""
+    
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.phases = []
+        self._lock = threading.Lock()
+    
+    def record(self, phase, started=None):
+        """Record a phase that began at started (default: since startup began)"""
+        started = self.origin if started is None else started
+        with self._lock:
+            self.phases.append((phase, time.perf_counter() - started))
+    
+    def report(self):
+        with self._lock:
+            return " • ".join(f"{phase} {seconds:.2f}s" for phase, seconds in self.phases)
+
+
+def pcm16_to_float32(pcm, rate, channels=1):
+    """Convert interleaved 16-bit PCM into a mono 16 kHz float32 array for Whisper"""
+    samples = np.frombuffer(pcm, dtype=np.int16)
+    if channels > 1:
+        usable = len(samples) - len(samples) % channels
+        samples = samples[:usable].reshape(-1, channels).mean(axis=1)
+    audio = samples.astype(np.float32)
+    audio *= 1.0 / 32768.0
+    if rate != WHISPER_SAMPLE_RATE and len(audio):
+        audio = StreamingResampler(rate).process(audio)
+    return audio
+
+
+def compute_input_levels(samples):
+    """Return (rms_dbfs, peak_dbfs, clipped_samples) for a block of int16 samples"""
+    if not len(samples):
+        return -96.0, -96.0, 0
+    audio = samples.astype(np.float32)
+    rms = float(np.sqrt(np.mean(audio * audio))) / 32768.0
+    peak = float(np.max(np.abs(audio))) / 32768.0
+    clipped = int(np.count_nonzero((samples >= 32767) | (samples <= -32768)))
+    return (20 * math.log10(max(rms, 1e-5)),
+            20 * math.log10(max(peak, 1e-5)),
+            clipped)
+
+
+def list_input_devices(p):
+    """Return (index, name, default_rate) for every device with input channels"""
+    devices = []
+    for index in range(p.get_device_count()):
+        info = p.get_device_info_by_index(index)
+        if info.get('maxInputChannels', 0) > 0:
+            devices.append((index, info['name'], int(info['defaultSampleRate'])))
+    return devices
+
+
+def negotiate_input_rate(p, device_index, format, channels, preferred=WHISPER_SAMPLE_RATE):
+    """Pick a capture rate the device supports, preferring Whisper's native rate"""
+    if device_index is None:
+        info = p.get_default_input_device_info()
+    else:
+        info = p.get_device_info_by_index(device_index)
+    default_rate = int(info['defaultSampleRate'])
+    
+    for rate in (preferred, 48000, default_rate, 44100):
+        try:
+            if p.is_format_supported(rate,
+                                     input_device=info['index'],
+                                     input_channels=channels,
+                                     input_format=format):
+                return rate
+        except ValueError:
+            # PyAudio raises instead of returning False for unsupported formats
+            continue
+    return default_rate
+
+
+class StreamingResampler:
+    """Stateful polyphase FIR resampler used to bring capture blocks to 16 kHz"""
+    
+    def __init__(self, in_rate, out_rate=WHISPER_SAMPLE_RATE, taps=32, block_size=16384):
+        g = math.gcd(in_rate, out_rate)
+        self.up = out_rate // g
+        self.down = in_rate // g
+        self.block_size = block_size
+        # Longer filters when decimating so the anti-alias transition stays narrow
+        self.taps = int(taps * max(1.0, self.down / self.up))
+        
+        # Kaiser-windowed sinc low-pass at the upsampled rate, below the lower Nyquist
+        n = self.up * self.taps
+        cutoff = 0.45 / max(self.up, self.down)
+        k = np.arange(n) - (n - 1) / 2
+        h = 2 * cutoff * np.sinc(2 * cutoff * k) * np.kaiser(n, 8.0)
+        h *= self.up / h.sum()
+        # bank[phase, i] = h[i * up + phase]
+        self.bank = h.reshape(self.taps, self.up).T.astype(np.float32)
+        
+        self._offsets = np.arange(self.taps)
+        self._history = np.zeros(self.taps - 1, dtype=np.float32)
+        self._consumed = 0
+        self._next_out = 0
+    
+    def process(self, samples):
+        """Resample the next block of a stream, returning float32 output samples"""
+        samples = np.asarray(samples, dtype=np.float32)
+        if self.up == self.down:
+            return samples
+        out = [self._process_block(samples[start:start + self.block_size])
+               for start in range(0, len(samples), self.block_size)]
+        return np.concatenate(out) if out else np.zeros(0, dtype=np.float32)
+    
+    def process_pcm16(self, pcm):
+        """Resample a block of 16-bit PCM and return it as int16 samples"""
+        audio = self.process(np.frombuffer(pcm, dtype=np.int16))
+        return np.clip(np.rint(audio), -32768, 32767).astype(np.int16)
+    
+    def _process_block(self, block):
+        buf = np.concatenate((self._history, block))
+        total = self._consumed + len(block)
+        end = (total * self.up + self.down - 1) // self.down
+        
+        n = np.arange(self._next_out, end)
+        base = n * self.down // self.up
+        phase = n * self.down % self.up
+        # Position of each output's newest input sample inside buf
+        idx = base - (self._consumed - (self.taps - 1))
+        windows = buf[idx[:, None] - self._offsets[None, :]]
+        out = np.einsum('ij,ij->i', windows, self.bank[phase])
+        
+        self._history = buf[len(buf) - (self.taps - 1):]
+        self._consumed = total
+        self._next_out = end
+        return out.astype(np.float32)
+
+
+def detect_speech_regions(audio, rate=WHISPER_SAMPLE_RATE, frame_ms=30, padding_ms=200,
+                          min_silence_ms=500, min_level_db=-50.0):
+    """Return (start, end) sample ranges that contain speech using energy and zero-crossings"""
+    frame = int(rate * frame_ms / 1000)
+    count = len(audio) // frame
+    if count == 0:
+        return [(0, len(audio))] if len(audio) else []
+    
+    frames = np.asarray(audio[:count * frame], dtype=np.float32).reshape(count, frame)
+    energy = np.sqrt(np.mean(frames * frames, axis=1))
+    signs = np.signbit(frames)
+    zcr = np.mean(signs[:, 1:] != signs[:, :-1], axis=1)
+    
+    # Adaptive threshold above the noise floor, capped so that recordings that are
+    # mostly speech do not push the threshold above quieter words
+    floor = np.percentile(energy, 10)
+    loud = np.percentile(energy, 95)
+    min_level = 10 ** (min_level_db / 20)
+    threshold = max(min_level, min(floor * 3.0, loud * 0.3))
+    speech = energy > threshold
+    # Unvoiced consonants are quiet but have a high zero-crossing rate
+    speech |= (energy > max(min_level, floor * 1.5)) & (zcr > 0.25)
+    
+    # Pad speech frames on both sides so word onsets and tails are kept
+    pad = int(padding_ms / frame_ms)
+    if pad:
+        speech = np.convolve(speech, np.ones(2 * pad + 1), mode='same') > 0
+    
+    edges = np.diff(np.concatenate(([0], speech.astype(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    
+    min_gap = max(1, int(min_silence_ms / frame_ms))
+    regions = []
+    for start, end in zip(starts, ends):
+        if regions and start - regions[-1][1] < min_gap:
+            regions[-1][1] = end
+        else:
+            regions.append([start, end])
+    
+    result = [(int(start * frame), int(end * frame)) for start, end in regions]
+    if result and regions[-1][1] == count:
+        result[-1] = (result[-1][0], len(audio))
+    return result
+
+
+class SpeechTimeline:
+    """Maps timestamps in silence-trimmed audio back to the original recording"""
+    
+    def __init__(self, regions, original_length, rate=WHISPER_SAMPLE_RATE):
+        self.regions = regions
+        self.original_length = original_length
+        self.rate = rate
+        lengths = np.array([end - start for start, end in regions], dtype=np.int64)
+        self.kept_samples = int(lengths.sum())
+        # Start of each region within the trimmed audio
+        self._trimmed_starts = np.concatenate(([0], np.cumsum(lengths)[:-1])) if regions else lengths
+    
+    @property
+    def removed_seconds(self):
+        return (self.original_length - self.kept_samples) / self.rate
+    
+    @property
+    def removed_fraction(self):
+        if not self.original_length:
+            return 0.0
+        return 1.0 - self.kept_samples / self.original_length
+    
+    def to_original(self, seconds):
+        """Convert a time in the trimmed audio to a time in the original audio"""
+        if not self.regions:
+            return seconds
+        sample = seconds * self.rate
+        i = max(0, int(np.searchsorted(self._trimmed_starts, sample, side='right')) - 1)
+        return (self.regions[i][0] + sample - self._trimmed_starts[i]) / self.rate
+    
+    def remap_segments(self, segments):
+        """Rewrite Whisper segment (and word) timestamps in place"""
+        for segment in segments:
+            segment["start"] = self.to_original(segment["start"])
+            segment["end"] = self.to_original(segment["end"])
+            for word in segment.get("words", []):
+                word["start"] = self.to_original(word["start"])
+                word["end"] = self.to_original(word["end"])
+        return segments
+
+
+def trim_silence(audio, rate=WHISPER_SAMPLE_RATE, **vad_options):
+    """Drop silent regions, returning the trimmed audio and its SpeechTimeline"""
+    regions = detect_speech_regions(audio, rate, **vad_options)
+    timeline = SpeechTimeline(regions, len(audio), rate)
+    if len(regions) == 1 and regions[0] == (0, len(audio)):
+        return audio, timeline
+    if not regions:
+        return audio[:0], timeline
+    return np.concatenate([audio[start:end] for start, end in regions]), timeline
+
+
+class UtteranceSegmenter:
+    """Live energy VAD that cuts a growing sample stream into utterances at pauses"""
+    
+    def __init__(self, rate=WHISPER_SAMPLE_RATE, frame_ms=30, min_level_db=-45.0,
+                 min_pause_ms=700, min_utterance_ms=300, max_utterance_seconds=30,
+                 pre_roll_ms=300):
+        self.frame = int(rate * frame_ms / 1000)
+        self.min_level = 10 ** (min_level_db / 20) * 32768
+        self.pause_frames = max(1, int(min_pause_ms / frame_ms))
+        self.min_utterance = int(rate * min_utterance_ms / 1000)
+        self.max_utterance = int(rate * max_utterance_seconds)
+        self.pre_roll = int(rate * pre_roll_ms / 1000)
+        self.position = 0  # samples consumed so far
+        self.noise_floor = None
+        self._pending = np.zeros(0, dtype=np.int16)
+        self._start = None
+        self._last_voice = 0
+        self._silent_frames = 0
+    
+    def process(self, samples):
+        """Feed new int16 samples; return (start, end) of utterances completed by them"""
+        data = np.concatenate((self._pending, samples))
+        count = len(data) // self.frame
+        self._pending = data[count * self.frame:]
+        if count == 0:
+            return []
+        
+        frames = data[:count * self.frame].astype(np.float32).reshape(count, self.frame)
+        energy = np.sqrt(np.mean(frames * frames, axis=1))
+        frame_start = self.position - (len(data) - len(samples))
+        
+        utterances = []
+        for i, level in enumerate(energy):
+            if self.noise_floor is None:
+                self.noise_floor = level
+            voiced = level > max(self.min_level, self.noise_floor * 3.0)
+            if not voiced:
+                # Track the background level only while nobody is speaking
+                self.noise_floor = 0.95 * self.noise_floor + 0.05 * level
+            
+            start = frame_start + i * self.frame
+            end = start + self.frame
+            if self._start is None:
+                if voiced:
+                    self._start = max(0, start - self.pre_roll)
+                    self._last_voice = end
+                    self._silent_frames = 0
+                continue
+            
+            if voiced:
+                self._last_voice = end
+                self._silent_frames = 0
+            else:
+                self._silent_frames += 1
+            
+            if self._silent_frames >= self.pause_frames or end - self._start >= self.max_utterance:
+                utterances.extend(self._close(end if voiced else self._last_voice))
+        
+        self.position += len(samples)
+        return utterances
+    
+    def flush(self):
+        """Close the utterance in progress, if any"""
+        if self._start is None:
+            return []
+        return self._close(self._last_voice)
+    
+    @property
+    def retain_from(self):
+        """Earliest sample index a future utterance can still start at"""
+        if self._start is not None:
+            return self._start
+        return max(0, self.position - len(self._pending) - self.pre_roll)
+    
+    def _close(self, end):
+        start, self._start = self._start, None
+        self._silent_frames = 0
+        if end - start >= self.min_utterance:
+            return [(start, end)]
+        return []
+
+
+class CaptureBuffer:
+    """Growable, contiguous int16 store for captured audio samples"""
+    
+    def __init__(self, rate, channels=1, initial_seconds=1800):
+        # np.empty only reserves address space; pages become resident as they
+        # are written, so a generous initial capacity costs nothing up front
+        self.rate = rate
+        self.channels = channels
+        self._data = np.empty(int(rate * channels * initial_seconds), dtype=np.int16)
+        self._length = 0
+        self._offset = 0  # index of the first sample still held
+        self._lock = threading.Lock()
+    
+    def __len__(self):
+        return self._length
+    
+    @property
+    def duration(self):
+        """Recorded length in seconds"""
+        return self._length / (self.rate * self.channels)
+    
+    def append(self, pcm):
+        """Append a block of interleaved 16-bit PCM"""
+        block = np.frombuffer(pcm, dtype=np.int16)
+        with self._lock:
+            used = self._length - self._offset
+            end = used + len(block)
+            if end > len(self._data):
+                self._grow(end)
+            self._data[used:end] = block
+            self._length += len(block)
+    
+    def _grow(self, required):
+        """Reallocate with amortized doubling (caller holds the lock)"""
+        data = np.empty(max(required, 2 * len(self._data)), dtype=np.int16)
+        used = self._length - self._offset
+        data[:used] = self._data[:used]
+        self._data = data
+    
+    def discard(self, before):
+        """Drop samples before index before; later indices stay valid
+        
+        The kept tail is moved to the front once at least as much has been
+        dropped as is kept, so the copying stays amortized and the storage
+        never grows past what an unconsumed stretch of audio needs.
+        """
+        with self._lock:
+            before = min(before, self._length)
+            dropped = before - self._offset
+            kept = self._length - before
+            if dropped <= 0 or dropped < kept:
+                return
+            self._data[:kept] = self._data[dropped:dropped + kept]
+            self._offset = before
+    
+    def samples(self, start=None, end=None):
+        """Return a zero-copy view of the recorded samples
+        
+        The view is only valid until the next discard().
+        """
+        with self._lock:
+            start = self._offset if start is None else start
+            if start < self._offset:
+                raise ValueError(f"samples before {self._offset} have been discarded")
+            end = self._length if end is None else min(end, self._length)
+            return self._data[start - self._offset:max(start, end) - self._offset]
+    
+    def view(self):
+        """Return the recorded PCM as a byte memoryview without concatenating"""
+        return memoryview(self.samples()).cast('B')
+
+
+def find_quiet_cut(samples, rate, search_seconds=5.0, frame_ms=30):
+    """Return the index of the quietest frame near the end of samples, for cutting windows"""
+    frame = int(rate * frame_ms / 1000)
+    search = min(len(samples), int(rate * search_seconds)) // frame * frame
+    if search < frame:
+        return len(samples)
+    tail = np.asarray(samples[len(samples) - search:], dtype=np.float32).reshape(-1, frame)
+    quietest = int(np.argmin(np.mean(tail * tail, axis=1)))
+    return len(samples) - search + quietest * frame + frame // 2
+
+
+WAV_HEADER_SIZE = 44
+
+
+def wav_header(rate, channels, data_bytes, sample_width=2):
+    """Build a canonical 44-byte PCM WAV header"""
+    return struct.pack('<4sI4s4sIHHIIHH4sI',
+                       b'RIFF', 36 + data_bytes, b'WAVE',
+                       b'fmt ', 16, 1, channels, rate,
+                       rate * channels * sample_width, channels * sample_width,
+                       sample_width * 8,
+                       b'data', data_bytes)
+
+
+class SpillingCaptureBuffer:
+    """Capture store that writes PCM into a memory-mapped WAV file one segment at a time
+    
+    Only the segment currently being filled is dirty in memory; completed segments
+    are flushed and left to the page cache, so RAM stays flat however long the
+    session runs. The WAV header is kept up to date so the file is playable while
+    recording continues and after a crash.
+    """
+    
+    def __init__(self, path, rate, channels=1, segment_seconds=60):
+        self.path = path
+        self.rate = rate
+        self.channels = channels
+        self.segment = int(rate * channels * segment_seconds)
+        self.closed = False
+        self._length = 0
+        self._lock = threading.Lock()
+        self._reader = None
+        self._file = open(path, 'w+b')
+        self._file.write(wav_header(rate, channels, 0))
+        self._map_segment(0)
+    
+    def __len__(self):
+        return self._length
+    
+    @property
+    def duration(self):
+        """Recorded length in seconds"""
+        return self._length / (self.rate * self.channels)
+    
+    def _map_segment(self, index):
+        """Extend the file by one segment and map it as the writable tail"""
+        offset = WAV_HEADER_SIZE + index * self.segment * 2
+        self._file.truncate(offset + self.segment * 2)
+        self._tail = np.memmap(self._file, dtype=np.int16, mode='r+',
+                               offset=offset, shape=(self.segment,))
+        self._tail_start = index * self.segment
+    
+    def _write_header(self):
+        self._file.seek(0)
+        self._file.write(wav_header(self.rate, self.channels, self._length * 2))
+        self._file.flush()
+    
+    def append(self, pcm):
+        """Append a block of interleaved 16-bit PCM"""
+        block = np.frombuffer(pcm, dtype=np.int16)
+        with self._lock:
+            while len(block):
+                used = self._length - self._tail_start
+                count = min(len(block), self.segment - used)
+                self._tail[used:used + count] = block[:count]
+                self._length += count
+                block = block[count:]
+                if used + count == self.segment:
+                    self._tail.flush()
+                    self._write_header()
+                    self._map_segment(self._length // self.segment)
+    
+    def flush(self):
+        """Persist everything captured so far, including the partial segment"""
+        with self._lock:
+            if not self.closed:
+                self._tail.flush()
+                self._write_header()
+    
+    def close(self):
+        """Finalize the WAV file; samples stay readable through a read-only mapping"""
+        with self._lock:
+            if self.closed:
+                return
+            self._tail.flush()
+            self._tail = None
+            self._write_header()
+            self._file.truncate(WAV_HEADER_SIZE + self._length * 2)
+            self._file.close()
+            self.closed = True
+    
+    def delete(self):
+        """Close the buffer and remove its file, e.g. when nothing was recorded"""
+        self.close()
+        self._reader = None
+        os.remove(self.path)
+    
+    def _committed_view(self, length):
+        """Read-only mapping of the first length samples of the file"""
+        if self._reader is None or len(self._reader) < length:
+            self._reader = np.memmap(self.path, dtype=np.int16, mode='r',
+                                     offset=WAV_HEADER_SIZE, shape=(length,))
+        return self._reader[:length]
+    
+    def samples(self, start=0, end=None):
+        """Return samples from the mapping (zero-copy unless the range spans the live tail)"""
+        with self._lock:
+            end = self._length if end is None else min(end, self._length)
+            if self.closed or end <= self._tail_start:
+                committed = self._length if self.closed else self._tail_start
+                return self._committed_view(committed)[start:end]
+            if start >= self._tail_start:
+                return self._tail[start - self._tail_start:end - self._tail_start]
+            return np.concatenate((self._committed_view(self._tail_start)[start:],
+                                   self._tail[:end - self._tail_start]))
+    
+    def view(self):
+        """Return the recorded PCM as a byte memoryview"""
+        return memoryview(np.ascontiguousarray(self.samples())).cast('B')
+
+
+class StreamingTranscriber:
+    """Transcribes overlapping windows of a growing recording on a background thread
+    
+    The first failing window stops live decoding (error holds the exception)
+    instead of retrying on every notify(); finish() or close() ends the thread.
+    """
+    
+    def __init__(self, transcribe, buffer, on_update, window_seconds=10.0, overlap_seconds=2.0):
+        self.transcribe = transcribe
+        self.buffer = buffer
+        self.on_update = on_update
+        self.window = int(window_seconds * buffer.rate)
+        self.overlap = int(overlap_seconds * buffer.rate)
+        self.committed = 0
+        self.final_segments = []
+        self.partial_text = ""
+        self.error = None
+        self._finishing = False
+        self._closed = False
+        self._on_finished = None
+        self._wakeup = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+    
+    @property
+    def final_text(self):
+        return " ".join(segment["text"].strip() for segment in self.final_segments).strip()
+    
+    def start(self):
+        self._thread.start()
+    
+    def notify(self):
+        """Signal that new audio is available in the buffer"""
+        self._wakeup.set()
+    
+    def finish(self, on_finished):
+        """Transcribe the remaining tail, then call on_finished(final_text)"""
+        self._on_finished = on_finished
+        self._finishing = True
+        self._wakeup.set()
+    
+    def close(self):
+        """Stop the worker without decoding the rest of the recording"""
+        self._closed = True
+        self._wakeup.set()
+    
+    def _run(self):
+        while True:
+            self._wakeup.wait()
+            self._wakeup.clear()
+            if self._closed:
+                return
+            try:
+                while (not self._finishing and self.error is None
+                       and len(self.buffer) - self.committed >= self.window):
+                    self._transcribe_window()
+                if self._finishing:
+                    self._transcribe_tail()
+                    self._on_finished(self.final_text)
+                    return
+            except Exception as e:
+                if self._finishing:
+                    print(f"Live transcription error: {e}")
+                    self._on_finished(self.final_text)
+                    return
+                print(f"Live transcription stopped: {e}")
+                self.error = e
+    
+    def _decode(self, start, end=None):
+        audio = pcm16_to_float32(self.buffer.samples(start, end), self.buffer.rate)
+        result = self.transcribe(audio, initial_prompt=self.final_text[-200:] or None)
+        offset = start / self.buffer.rate
+        for segment in result["segments"]:
+            segment["start"] += offset
+            segment["end"] += offset
+        return result["segments"]
+    
+    def _transcribe_window(self):
+        start = self.committed
+        segments = self._decode(start, start + self.window)
+        
+        # Segments ending before the overlap are final; the rest stay partial
+        # and are decoded again with more context in the next window
+        boundary = (start + self.window - self.overlap) / self.buffer.rate
+        final = [segment for segment in segments if segment["end"] <= boundary]
+        partial = segments[len(final):]
+        self.final_segments.extend(final)
+        if final:
+            # Always move forward, even if Whisper reports a degenerate segment
+            self.committed = max(int(final[-1]["end"] * self.buffer.rate), start + self.overlap)
+        else:
+            self.committed = start + self.window - self.overlap
+        self.partial_text = " ".join(segment["text"].strip() for segment in partial)
+        self.on_update(self.final_text, self.partial_text)
+    
+    def _transcribe_tail(self):
+        if len(self.buffer) > self.committed:
+            self.final_segments.extend(self._decode(self.committed))
+            self.committed = len(self.buffer)
+        self.partial_text = ""
+        self.on_update(self.final_text, "")
+
+
+class CaptureEngine:
+    """Callback-mode PyAudio capture that hands blocks over through a queue"""
+    
+    def __init__(self, p, format, channels, rate, chunk, input_device_index=None):
+        self.p = p
+        self.format = format
+        self.channels = channels
+        self.rate = rate
+        self.chunk = chunk
+        self.input_device_index = input_device_index
+        self.stream = None
+        self.overflows = 0
+        # SimpleQueue.put never blocks, so the PortAudio callback stays cheap
+        self.blocks = queue.SimpleQueue()
+    
+    def _callback(self, in_data, frame_count, time_info, status):
+        if status & PA_INPUT_OVERFLOW:
+            self.overflows += 1
+        self.blocks.put(in_data)
+        return (None, PA_CONTINUE)
+    
+    def start(self):
+        """Open the input stream and start delivering blocks"""
+        self.overflows = 0
+        self.stream = self.p.open(
+            format=self.format,
+            channels=self.channels,
+            rate=self.rate,
+            input=True,
+            input_device_index=self.input_device_index,
+            frames_per_buffer=self.chunk,
+            stream_callback=self._callback
+        )
+        self.stream.start_stream()
+    
+    def stop(self):
+        """Stop and close the stream; no callbacks run after this returns"""
+        if self.stream is not None:
+            self.stream.stop_stream()
+            self.stream.close()
+            self.stream = None
+    
+    def drain(self):
+        """Return every block captured since the previous drain"""
+        blocks = []
+        while True:
+            try:
+                blocks.append(self.blocks.get_nowait())
+            except queue.Empty:
+                return blocks
+
+
+def whisper_internal(whisper_module, attribute):
+    """Look up a private openai-whisper attribute the model store depends on"""
+    try:
+        return getattr(whisper_module, attribute)
+    except AttributeError:
+        raise RuntimeError(f"Unsupported Whisper version: whisper.{attribute} not found "
+                           "(the local model store relies on openai-whisper internals)")
+
+
+def model_size_bytes(model):
+    """Estimate the memory held by a torch model's weights"""
+    if hasattr(model, 'state_dict'):
+        # The state dict also covers packed weights of quantized layers
+        tensors = []
+        for value in model.state_dict().values():
+            tensors.extend(value if isinstance(value, tuple) else [value])
+    else:
+        tensors = list(model.parameters()) + list(model.buffers())
+    return sum(t.numel() * t.element_size() for t in tensors if hasattr(t, 'numel'))
+
+
+class LocalModelStore:
+    """Directory of Whisper checkpoints converted once for memory-mapped loading
+    
+    Weights are stored as safetensors when that package is installed (otherwise
+    as a plain torch state dict) next to a JSON file with the model dimensions.
+    Loading maps the weight file instead of deserializing it, so it is near
+    instant and processes on the same machine share the page cache.
+    """
+    
+    def __init__(self, directory):
+        self.directory = directory
+    
+    def _meta_path(self, name):
+        return os.path.join(self.directory, f"{name}.json")
+    
+    def has(self, name):
+        return os.path.exists(self._meta_path(name))
+    
+    def convert(self, name, checkpoint_path=None):
+        """Convert an openai-whisper checkpoint (downloaded into the store if needed)"""
+        import torch
+        whisper_module = import_whisper()
+        os.makedirs(self.directory, exist_ok=True)
+        if checkpoint_path is None:
+            # Reuse a checkpoint already in whisper's own cache; the downloader checks
+            # the SHA256 and only goes to the network when the file is missing
+            url = whisper_internal(whisper_module, "_MODELS")[name]
+            cache_root = os.getenv("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache"))
+            whisper_cache = os.path.join(cache_root, "whisper")
+            root = whisper_cache if os.path.exists(os.path.join(whisper_cache, os.path.basename(url))) else self.directory
+            checkpoint_path = whisper_internal(whisper_module, "_download")(url, root, False)
+        
+        checkpoint = torch.load(checkpoint_path, map_location="cpu")
+        state = {key: value.contiguous() for key, value in checkpoint["model_state_dict"].items()}
+        try:
+            from safetensors.torch import save_file
+            weight_format, extension = "safetensors", "safetensors"
+        except ImportError:
+            save_file = None
+            weight_format, extension = "torch", "pt"
+        
+        weights_path = os.path.join(self.directory, f"{name}.weights.{extension}")
+        temp_path = f"{weights_path}.{os.getpid()}.tmp"
+        if save_file is not None:
+            save_file(state, temp_path)
+        else:
+            torch.save(state, temp_path)
+        os.replace(temp_path, weights_path)
+        
+        meta = {"dims": checkpoint["dims"], "format": weight_format,
+                "weights": os.path.basename(weights_path)}
+        meta_temp_path = f"{self._meta_path(name)}.{os.getpid()}.tmp"
+        with open(meta_temp_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(meta_temp_path, self._meta_path(name))
+    
+    def load(self, name):
+        """Load a converted model with memory-mapped weights, converting it first if needed"""
+        if not self.has(name):
+            self.convert(name)
+        
+        import torch
+        whisper_module = import_whisper()
+        with open(self._meta_path(name), encoding="utf-8") as f:
+            meta = json.load(f)
+        weights_path = os.path.join(self.directory, meta["weights"])
+        
+        if meta["format"] == "safetensors":
+            from safetensors.torch import load_file
+            state = load_file(weights_path)
+        else:
+            state = torch.load(weights_path, map_location="cpu", mmap=True, weights_only=True)
+        
+        # Build the module without allocating weights, then adopt the mapped tensors
+        dims = whisper_module.model.ModelDimensions(**meta["dims"])
+        model = self._build_empty_model(dims)
+        model.load_state_dict(state, assign=True)
+        self._rebuild_buffers(model, name, dims)
+        
+        if torch.cuda.is_available():
+            model = model.to("cuda")
+        return model
+    
+    def _build_empty_model(self, dims):
+        """Construct a Whisper model whose parameters live on the meta device
+        
+        Mirrors Whisper.__init__, which cannot run on the meta device itself
+        because it builds a sparse tensor; strict state-dict loading catches any
+        drift from the installed Whisper version.
+        """
+        import torch
+        whisper_model = import_whisper().model
+        model = whisper_model.Whisper.__new__(whisper_model.Whisper)
+        torch.nn.Module.__init__(model)
+        model.dims = dims
+        with torch.device("meta"):
+            model.encoder = whisper_model.AudioEncoder(dims.n_mels, dims.n_audio_ctx,
+                                                       dims.n_audio_state, dims.n_audio_head,
+                                                       dims.n_audio_layer)
+            model.decoder = whisper_model.TextDecoder(dims.n_vocab, dims.n_text_ctx,
+                                                      dims.n_text_state, dims.n_text_head,
+                                                      dims.n_text_layer)
+        return model
+    
+    def _rebuild_buffers(self, model, name, dims):
+        """Recreate the non-persistent buffers that are not part of the state dict"""
+        import torch
+        whisper_module = import_whisper()
+        mask = torch.empty(dims.n_text_ctx, dims.n_text_ctx).fill_(-np.inf).triu_(1)
+        model.decoder.register_buffer("mask", mask, persistent=False)
+        
+        heads = whisper_internal(whisper_module, "_ALIGNMENT_HEADS").get(name)
+        if heads is not None:
+            model.set_alignment_heads(heads)
+        else:
+            all_heads = torch.zeros(dims.n_text_layer, dims.n_text_head, dtype=torch.bool)
+            all_heads[dims.n_text_layer // 2:] = True
+            model.register_buffer("alignment_heads", all_heads.to_sparse(), persistent=False)
+        
+        missing = [key for key, buffer in model.named_buffers() if buffer.is_meta]
+        if missing:
+            raise RuntimeError(f"Unsupported Whisper version, unmapped buffers: {missing}")
+
+
+# Suffix of model-manager keys for int8-quantized variants, e.g. "small-int8"
+QUANTIZED_SUFFIX = "-int8"
+
+
+def quantize_whisper_model(model):
+    """Apply dynamic int8 quantization to the Linear layers of a CPU Whisper model"""
+    import torch
+    whisper_model = import_whisper().model
+    for module in model.modules():
+        if type(module) is whisper_model.Linear:
+            # whisper's Linear only overrides forward() to cast weights for fp16;
+            # quantize_dynamic matches exact types, so present it as a plain Linear
+            module.__class__ = torch.nn.Linear
+    return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear},
+                                                  dtype=torch.qint8, inplace=True)
+
+
+def configure_torch_threads(intra_op_threads, inter_op_threads):
+    """Limit torch's CPU thread pools, leaving cores free for Tk and audio capture"""
+    import torch
+    torch.set_num_threads(intra_op_threads)
+    try:
+        torch.set_num_interop_threads(inter_op_threads)
+    except RuntimeError:
+        # Only allowed before torch starts its inter-op pool
+        print("Inter-op thread count already fixed; keeping the existing value")
+
+
+def warm_up_model(model, seconds=1.0):
+    """Run one transcription on synthetic audio so lazy kernel setup happens now"""
+    rng = np.random.default_rng(0)
+    audio = (rng.standard_normal(int(WHISPER_SAMPLE_RATE * seconds)) * 0.01).astype(np.float32)
+    model.transcribe(audio, fp16=model.device.type != 'cpu')
+
+
+class InferenceStats:
+    """First-call versus steady-state transcription latency per model"""
+    
+    def __init__(self):
+        self._stats = {}
+        self._lock = threading.Lock()
+    
+    def _entry(self, model_name):
+        return self._stats.setdefault(model_name, {"warm_up": None, "first": None, "calls": 0,
+                                                   "seconds": 0.0, "audio": 0.0})
+    
+    def record_warm_up(self, model_name, seconds):
+        """Record the synthetic warm-up run, kept apart from real transcriptions"""
+        with self._lock:
+            self._entry(model_name)["warm_up"] = seconds
+    
+    def record(self, model_name, seconds, audio_seconds):
+        with self._lock:
+            entry = self._entry(model_name)
+            if entry["first"] is None:
+                entry["first"] = seconds
+            else:
+                entry["calls"] += 1
+                entry["seconds"] += seconds
+                entry["audio"] += audio_seconds
+    
+    def summary(self, model_name):
+        """Human-readable latency summary for the status bar"""
+        with self._lock:
+            entry = self._stats.get(model_name)
+            if entry is None:
+                return ""
+            parts = []
+            if entry["warm_up"] is not None:
+                parts.append(f"warm-up {entry['warm_up']:.2f}s")
+            if entry["first"] is not None:
+                parts.append(f"first call {entry['first']:.2f}s")
+            text = f"⏱️ {model_name}: " + " • ".join(parts)
+            if entry["calls"]:
+                text += f" • steady {entry['seconds'] / entry['calls']:.2f}s/call"
+                if entry["audio"]:
+                    text += f" ({entry['seconds'] / entry['audio']:.2f}x real-time)"
+            return text
+
+
+class ASRBackend(ABC):
+    """Speech-recognition engine interface used by the transcription pipeline
+
+    Subclasses implement load_model() and run(). transcribe() returns an
+    openai-whisper style result ({"text", "segments", "language"}) with a
+    "timings" entry added, so callers never depend on a particular engine.
+    """
+
+    name = "asr"
+
+    def __init__(self):
+        self.load_times = {}
+
+    def load(self, model_name):
+        """Load a model by name (sizes may carry the -int8 suffix) and time it"""
+        started = time.perf_counter()
+        model = self.load_model(model_name)
+        self.load_times[model_name] = time.perf_counter() - started
+        return model
+
+    @abstractmethod
+    def load_model(self, model_name):
+        """Load and return the engine's model object"""
+
+    @abstractmethod
+    def run(self, model, audio, **options):
+        """Transcribe audio into an openai-whisper style result"""
+
+    def decode_audio(self, path):
+        """Decode an audio file to a 16 kHz float32 array"""
+        return import_whisper().load_audio(path)
+
+    def transcribe(self, model, audio, **options):
+        """Transcribe a 16 kHz float32 array or an audio file path"""
+        started = time.perf_counter()
+        if isinstance(audio, str):
+            # Both engines would decode the file anyway; doing it here gives
+            # the real-time factor an audio length to work with
+            audio = self.decode_audio(audio)
+        result = self.run(model, audio, **options)
+        audio_seconds = len(audio) / WHISPER_SAMPLE_RATE
+        result["timings"] = {"transcribe": time.perf_counter() - started, "audio": audio_seconds}
+        return result
+
+    def prepare(self, model_name):
+        """Fetch or convert the model's files so several processes can then load it"""
+
+    def stream_segments(self, model, audio, **options):
+        """Yield segments as they are decoded; engines without streaming yield them at the end"""
+        yield from self.transcribe(model, audio, **options)["segments"]
+
+    def warm_up(self, model, seconds=1.0):
+        rng = np.random.default_rng(0)
+        audio = (rng.standard_normal(int(WHISPER_SAMPLE_RATE * seconds)) * 0.01).astype(np.float32)
+        self.run(model, audio)
+
+    def memory_bytes(self, model_name, model):
+        return model_size_bytes(model)
+    
+    def configure_threads(self, threads):
+        """Set the engine's CPU threads for this process"""
+
+
+class WhisperBackend(ASRBackend):
+    """openai-whisper (PyTorch), loaded from the local memory-mapped model store"""
+
+    name = "whisper"
+
+    def __init__(self, store):
+        super().__init__()
+        self.store = store
+
+    def load_model(self, model_name):
+        quantize = model_name.endswith(QUANTIZED_SUFFIX)
+        if quantize:
+            model_name = model_name[:-len(QUANTIZED_SUFFIX)]
+        try:
+            model = self.store.load(model_name)
+        except (RuntimeError, TypeError) as e:
+            # Older torch (no mmap/assign loading) or an unexpected Whisper version;
+            # whisper can still load offline from the checkpoint kept in the store
+            print(f"Memory-mapped load of '{model_name}' unavailable ({e}); using whisper.load_model")
+            model = import_whisper().load_model(model_name, download_root=self.store.directory)
+
+        if quantize:
+            if model.device.type != 'cpu':
+                raise RuntimeError("int8 quantization is only available for CPU inference")
+            model = quantize_whisper_model(model)
+        return model
+
+    def prepare(self, model_name):
+        if model_name.endswith(QUANTIZED_SUFFIX):
+            model_name = model_name[:-len(QUANTIZED_SUFFIX)]
+        if not self.store.has(model_name):
+            self.store.convert(model_name)
+
+    def run(self, model, audio, **options):
+        # Half precision only exists on GPU; on CPU Whisper would warn and use fp32 anyway
+        options["fp16"] = options.get("fp16", True) and model.device.type != 'cpu'
+        return model.transcribe(audio, **options)
+
+    def warm_up(self, model, seconds=1.0):
+        warm_up_model(model, seconds)
+    
+    def configure_threads(self, threads):
+        configure_torch_threads(threads, 1)
+
+
+class FasterWhisperBackend(ASRBackend):
+    """CTranslate2 engine via faster-whisper, loading locally converted models
+
+    Each model lives in <directory>/<size>, as written by
+    `ct2-transformers-converter --model openai/whisper-<size> --output_dir <directory>/<size>`.
+    The -int8 suffix selects int8 compute instead of float32.
+    """
+
+    name = "faster-whisper"
+
+    def __init__(self, directory, cpu_threads=0):
+        super().__init__()
+        self.directory = directory
+        self.cpu_threads = cpu_threads
+
+    def model_path(self, model_name):
+        if model_name.endswith(QUANTIZED_SUFFIX):
+            model_name = model_name[:-len(QUANTIZED_SUFFIX)]
+        return os.path.join(self.directory, model_name)
+
+    def load_model(self, model_name):
+        path = self.model_path(model_name)
+        if not os.path.isfile(os.path.join(path, "model.bin")):
+            raise FileNotFoundError(f"No converted faster-whisper model in {path}")
+        try:
+            from faster_whisper import WhisperModel
+        except ImportError:
+            raise RuntimeError("faster-whisper is not installed (pip install faster-whisper)")
+
+        compute_type = "int8" if model_name.endswith(QUANTIZED_SUFFIX) else "float32"
+        return WhisperModel(path, device="cpu", compute_type=compute_type,
+                            cpu_threads=self.cpu_threads)
+
+    @staticmethod
+    def _options(options):
+        # faster-whisper picks its precision from compute_type and has no verbose mode
+        options = {key: value for key, value in options.items() if key not in ("fp16", "verbose")}
+        # Whisper means greedy by beam_size=None; faster-whisper wants 1 beam
+        if "beam_size" in options and options["beam_size"] is None:
+            options["beam_size"] = 1
+        if "best_of" in options and options["best_of"] is None:
+            del options["best_of"]
+        return options
+
+    @staticmethod
+    def _segment(segment):
+        return {"id": segment.id, "start": segment.start, "end": segment.end,
+                "text": segment.text, "avg_logprob": segment.avg_logprob,
+                "compression_ratio": segment.compression_ratio,
+                "no_speech_prob": segment.no_speech_prob}
+
+    def decode_audio(self, path):
+        from faster_whisper import decode_audio
+        return decode_audio(path, sampling_rate=WHISPER_SAMPLE_RATE)
+
+    def run(self, model, audio, **options):
+        segments, info = model.transcribe(audio, **self._options(options))
+        segments = [self._segment(segment) for segment in segments]
+        return {"text": "".join(segment["text"] for segment in segments),
+                "segments": segments,
+                "language": info.language}
+
+    def stream_segments(self, model, audio, **options):
+        # faster-whisper decodes lazily, one segment per iteration
+        segments, _ = model.transcribe(audio, **self._options(options))
+        for segment in segments:
+            yield self._segment(segment)
+
+    def memory_bytes(self, model_name, model):
+        return os.path.getsize(os.path.join(self.model_path(model_name), "model.bin"))
+    
+    def configure_threads(self, threads):
+        self.cpu_threads = threads
+
+
+class LanguageTracker:
+    """Session language passed to the ASR engine so it can skip language detection
+    
+    The first detected language is remembered; a pinned language always wins.
+    A remembered language is dropped again when a transcript decoded with it
+    looks unreliable, so the next transcription re-detects.
+    """
+    
+    def __init__(self, min_logprob=-1.0, no_speech_threshold=0.6):
+        self.min_logprob = min_logprob
+        self.no_speech_threshold = no_speech_threshold
+        self.pinned = None
+        self.detected = None
+        self._lock = threading.Lock()
+    
+    def pin(self, language):
+        """Pin a language code, or None to go back to detection"""
+        with self._lock:
+            self.pinned = language or None
+    
+    def language(self):
+        with self._lock:
+            return self.pinned or self.detected
+    
+    def confidence(self, segments):
+        """Duration-weighted mean avg_logprob of the speech segments, or None"""
+        total = weight = 0.0
+        for segment in segments:
+            if segment.get("no_speech_prob", 0.0) > self.no_speech_threshold or "avg_logprob" not in segment:
+                continue
+            duration = max(segment["end"] - segment["start"], 0.01)
+            total += segment["avg_logprob"] * duration
+            weight += duration
+        return total / weight if weight else None
+    
+    def observe(self, result, forced_language=None):
+        """Update the session language from a transcription result"""
+        with self._lock:
+            if self.pinned:
+                return
+            if forced_language is None:
+                if result.get("language") and result.get("segments"):
+                    if result["language"] != self.detected:
+                        print(f"Session language: {result['language']}")
+                    self.detected = result["language"]
+                return
+        
+        logprob = self.confidence(result.get("segments", []))
+        if logprob is not None and logprob < self.min_logprob:
+            with self._lock:
+                if self.detected == forced_language:
+                    print(f"Low confidence in '{forced_language}' ({logprob:.2f}); re-detecting language")
+                    self.detected = None
+
+
+class TranscriptCache:
+    """Persistent transcripts keyed by audio content, model and decoding options
+    
+    Results live in SQLite and are evicted least recently used first once the
+    stored JSON exceeds max_mb. Concurrent requests for the same key share a
+    single computation.
+    """
+    
+    def __init__(self, path, max_mb=256):
+        self.path = path
+        self.max_bytes = max_mb * 1024 * 1024
+        self._lock = threading.Lock()
+        self._flights = {}
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._connect() as db:
+            db.execute("CREATE TABLE IF NOT EXISTS transcripts "
+                       "(key TEXT PRIMARY KEY, result TEXT, size INTEGER, last_used REAL)")
+    
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+    
+    @staticmethod
+    def audio_digest(audio):
+        """Content hash of a float32 array or of an audio file's bytes"""
+        digest = hashlib.blake2b(digest_size=20)
+        if isinstance(audio, str):
+            with open(audio, 'rb') as f:
+                for block in iter(lambda: f.read(1024 * 1024), b""):
+                    digest.update(block)
+        else:
+            digest.update(np.ascontiguousarray(audio, dtype=np.float32))
+        return digest.hexdigest()
+    
+    @staticmethod
+    def key(audio_digest, model_name, options):
+        return hashlib.blake2b(json.dumps([audio_digest, model_name, options], sort_keys=True,
+                                          default=str).encode(), digest_size=20).hexdigest()
+    
+    def get(self, key):
+        with self._connect() as db:
+            row = db.execute("SELECT result FROM transcripts WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            db.execute("UPDATE transcripts SET last_used = ? WHERE key = ?", (time.time(), key))
+        return json.loads(row[0])
+    
+    def put(self, key, result):
+        stored = {name: result[name] for name in ("text", "segments", "language") if name in result}
+        data = json.dumps(stored, default=lambda value: value.item() if hasattr(value, 'item') else str(value))
+        with self._lock, self._connect() as db:
+            db.execute("INSERT OR REPLACE INTO transcripts VALUES (?, ?, ?, ?)",
+                       (key, data, len(data), time.time()))
+            total = db.execute("SELECT COALESCE(SUM(size), 0) FROM transcripts").fetchone()[0]
+            for old_key, size in db.execute("SELECT key, size FROM transcripts "
+                                            "ORDER BY last_used").fetchall():
+                if total <= self.max_bytes:
+                    break
+                if old_key != key:
+                    db.execute("DELETE FROM transcripts WHERE key = ?", (old_key,))
+                    total -= size
+    
+    def get_or_compute(self, key, compute):
+        """Return the cached result for key, computing and storing it once if missing"""
+        with self._lock:
+            flight = self._flights.setdefault(key, threading.Lock())
+        try:
+            with flight:
+                result = self.get(key)
+                if result is None:
+                    result = compute()
+                    self.put(key, result)
+                return result
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+
+
+class DecodedAudioCache:
+    """Compressed input files decoded once to 16 kHz float32 .npy files
+    
+    Entries are named after the file's path, size and modification time and
+    are returned memory-mapped, so repeated transcriptions of an hour-long file
+    neither re-run ffmpeg nor copy the samples. The directory is kept under
+    max_mb by deleting the least recently used entries.
+    """
+    
+    def __init__(self, directory, max_mb=2048, decoder=None):
+        self.directory = directory
+        self.max_bytes = max_mb * 1024 * 1024
+        self.decoder = decoder or (lambda path: import_whisper().load_audio(path))
+        self._lock = threading.Lock()
+        self._flights = {}
+    
+    def entry_path(self, file_path):
+        stat = os.stat(file_path)
+        identity = f"{os.path.realpath(file_path)}:{stat.st_size}:{stat.st_mtime_ns}"
+        name = hashlib.blake2b(identity.encode(), digest_size=16).hexdigest()
+        return os.path.join(self.directory, f"{name}.npy")
+    
+    def load(self, file_path):
+        """Decoded samples of file_path, decoding (once, even for concurrent callers) if needed"""
+        entry = self.entry_path(file_path)
+        with self._lock:
+            flight = self._flights.setdefault(entry, threading.Lock())
+        try:
+            with flight:
+                if os.path.exists(entry):
+                    os.utime(entry)  # mark as recently used
+                else:
+                    audio = np.asarray(self.decoder(file_path), dtype=np.float32)
+                    os.makedirs(self.directory, exist_ok=True)
+                    partial = f"{entry}.{threading.get_ident()}.tmp"
+                    with open(partial, 'wb') as f:
+                        np.save(f, audio)
+                    os.replace(partial, entry)
+                    self._evict(keep=entry)
+            return np.load(entry, mmap_mode='r')
+        finally:
+            with self._lock:
+                self._flights.pop(entry, None)
+    
+    def _evict(self, keep):
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".npy"):
+                path = os.path.join(self.directory, name)
+                stat = os.stat(path)
+                entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if path != keep:
+                # Mapped arrays keep their data on POSIX; Windows refuses while mapped
+                try:
+                    os.remove(path)
+                    total -= size
+                except OSError:
+                    pass
+
+
+def split_model_key(key):
+    """Split a model-manager key such as "faster-whisper:base" into (engine, model name)"""
+    engine, _, name = key.rpartition(":")
+    return engine or WhisperBackend.name, name
+
+
+def plan_chunks(audio, rate=WHISPER_SAMPLE_RATE, chunk_seconds=120, overlap_seconds=1.0):
+    """Split audio at quiet points into chunks of about chunk_seconds
+    
+    Returns (start, end, own_start, own_end) sample ranges: each chunk owns the
+    span between its cuts and is padded by overlap_seconds on both sides so
+    words at a cut are heard in full by one of the neighbours.
+    """
+    length = len(audio)
+    chunk = int(chunk_seconds * rate)
+    cuts = [0]
+    # Stop early rather than leave a short last chunk
+    while length - cuts[-1] > chunk * 1.5:
+        start = cuts[-1]
+        cuts.append(start + find_quiet_cut(audio[start:start + chunk], rate,
+                                           search_seconds=min(10.0, chunk_seconds / 4)))
+    cuts.append(length)
+    overlap = int(overlap_seconds * rate)
+    return [(max(0, start - overlap), min(length, end + overlap), start, end)
+            for start, end in zip(cuts, cuts[1:])]
+
+
+def stitch_chunks(chunks, results, rate=WHISPER_SAMPLE_RATE):
+    """Merge per-chunk results into one, shifting timestamps and dropping overlap duplicates
+    
+    A segment is kept only by the chunk that owns its midpoint; a segment that
+    repeats the previous one's text while overlapping it is dropped as well.
+    """
+    segments = []
+    for (start, _, own_start, own_end), result in zip(chunks, results):
+        offset = start / rate
+        for segment in result["segments"]:
+            segment["start"] += offset
+            segment["end"] += offset
+            middle = (segment["start"] + segment["end"]) / 2
+            if not own_start / rate <= middle < own_end / rate:
+                continue
+            if (segments and segment["text"].strip() == segments[-1]["text"].strip()
+                    and segment["start"] < segments[-1]["end"]):
+                continue
+            segments.append(segment)
+    for number, segment in enumerate(segments):
+        segment["id"] = number
+    language = next((result.get("language") for result in results if result.get("language")), None)
+    return {"text": "".join(segment["text"] for segment in segments),
+            "segments": segments, "language": language}
+
+
+# Per-process state of the parallel transcription workers
+_chunk_backend = None
+_chunk_model = None
+
+
+def _load_chunk_model(backend, model_name, threads):
+    """Pool initializer: each worker process loads its own copy of the model"""
+    global _chunk_backend, _chunk_model
+    backend.configure_threads(threads)
+    _chunk_backend = backend
+    _chunk_model = backend.load(model_name)
+
+
+def _transcribe_chunk(audio, options):
+    result = _chunk_backend.transcribe(_chunk_model, audio, **options)
+    return {name: result.get(name) for name in ("text", "segments", "language")}
+
+
+def transcribe_in_parallel(backend, model_name, audio, chunks, options, workers, threads_per_worker,
+                           on_progress=None):
+    """Transcribe planned chunks in a pool of worker processes and stitch the results
+    
+    Workers are spawned rather than forked so they do not inherit Tk or audio
+    threads. Models loaded from the local store are memory-mapped, so the
+    workers share one copy of the weights in the page cache.
+    """
+    pool = None
+    futures = []
+    if workers > 1:
+        # Download/convert once here; workers racing to do it would clash on the same files
+        backend.prepare(model_name)
+        pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                                   initializer=_load_chunk_model,
+                                   initargs=(backend, model_name, threads_per_worker))
+    else:
+        # Single worker: run in this process instead of paying for a spawn
+        _load_chunk_model(backend, model_name, threads_per_worker)
+    
+    try:
+        if pool is not None:
+            futures = [pool.submit(_transcribe_chunk, np.array(audio[start:end]), options)
+                       for start, end, _, _ in chunks]
+            pending = (future.result for future in futures)
+        else:
+            pending = (functools.partial(_transcribe_chunk, audio[start:end], options)
+                       for start, end, _, _ in chunks)
+        results = []
+        for job in pending:
+            results.append(job())
+            if on_progress:
+                on_progress(len(results), len(chunks))
+    finally:
+        if pool is not None:
+            for future in futures:
+                future.cancel()
+            pool.shutdown()
+    return stitch_chunks(chunks, results)
+
+
+class WhisperModelManager:
+    """Bounded LRU of loaded Whisper models with a RAM budget and idle unloading"""
+
+    def __init__(self, loader, ram_budget_mb=3072, idle_minutes=10, size_of=None):
+        self.loader = loader
+        # size_of(name, model) -> bytes; defaults to counting torch weights
+        self.size_of = size_of or (lambda name, model: model_size_bytes(model))
+        self.ram_budget = ram_budget_mb * 1024 * 1024
+        self.idle_seconds = idle_minutes * 60
+        self._models = OrderedDict()  # name -> [model, size_bytes, last_used, users]
+        self._lock = threading.Lock()
+        self._load_locks = {}
+    
+    def loaded(self):
+        """Names of the resident models, least recently used first"""
+        with self._lock:
+            return list(self._models)
+    
+    def memory_bytes(self):
+        with self._lock:
+            return sum(entry[1] for entry in self._models.values())
+    
+    def get(self, name):
+        """Return the named model, loading it (once, even with concurrent callers) if needed"""
+        with self._lock:
+            load_lock = self._load_locks.setdefault(name, threading.Lock())
+        with load_lock:
+            with self._lock:
+                if name in self._models:
+                    entry = self._models[name]
+                    entry[2] = time.monotonic()
+                    self._models.move_to_end(name)
+                    return entry[0]
+            
+            model = self.loader(name)
+            with self._lock:
+                self._models[name] = [model, self.size_of(name, model), time.monotonic(), 0]
+                self._evict_over_budget(keep=name)
+            return model
+    
+    @contextmanager
+    def use(self, name):
+        """Borrow a model; it is never unloaded as idle while borrowed"""
+        model = self.get(name)
+        with self._lock:
+            entry = self._models.get(name)
+            if entry is not None:
+                entry[3] += 1
+        try:
+            yield model
+        finally:
+            with self._lock:
+                entry = self._models.get(name)
+                if entry is not None:
+                    entry[2] = time.monotonic()
+                    entry[3] -= 1
+    
+    def _evict_over_budget(self, keep):
+        """Drop least recently used models until under budget (caller holds the lock)"""
+        total = sum(entry[1] for entry in self._models.values())
+        for name in list(self._models):
+            if total <= self.ram_budget:
+                break
+            if name == keep or self._models[name][3]:
+                continue
+            total -= self._models.pop(name)[1]
+            print(f"Unloaded Whisper model '{name}' to stay within the RAM budget")
+    
+    def unload(self, name):
+        with self._lock:
+            return self._models.pop(name, None) is not None
+    
+    def unload_idle(self, now=None):
+        """Unload models unused for longer than the idle timeout; returns their names"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            idle = [name for name, entry in self._models.items()
+                    if not entry[3] and now - entry[2] >= self.idle_seconds]
+            for name in idle:
+                del self._models[name]
+        return idle
+
+
+class LMStudioClient:
+    """Shared keep-alive HTTP client for all LM Studio requests
+    
+    Connections are pooled per host and reused across turns. Failed connects
+    and 502/503/504 answers are retried with exponential backoff; a request
+    whose connection broke after it was sent is not, so a chat completion is
+    never generated twice.
+    """
+    
+    def __init__(self, api_key, pool_size=4, connect_timeout=5, read_timeout=60,
+                 retries=3, backoff=0.5):
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        retry_options = dict(total=retries, connect=retries, read=0, status=retries,
+                             backoff_factor=backoff, status_forcelist=(502, 503, 504),
+                             raise_on_status=False)
+        try:
+            retry = Retry(allowed_methods=frozenset({"GET", "POST"}), **retry_options)
+        except TypeError:
+            # urllib3 < 1.26
+            retry = Retry(method_whitelist=frozenset({"GET", "POST"}), **retry_options)
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=pool_size, max_retries=retry)
+        
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({"Content-Type": "application/json",
+                                     "Authorization": f"Bearer {api_key}"})
+    
+    def models(self, chat_url):
+        """GET the server's model list (derived from the chat completions URL)"""
+        # The model list is small; a server that is slow to send it counts as down
+        return self.session.get(chat_url.replace("/chat/completions", "/models"),
+                                timeout=(self.connect_timeout, self.connect_timeout))
+    
+    def chat(self, chat_url, payload):
+        """POST a chat completion; the response body is streamed"""
+        return self.session.post(chat_url, json=payload, stream=True,
+                                 timeout=(self.connect_timeout, self.read_timeout))
+    
+    def close(self):
+        self.session.close()
+
+
+class Job:
+    """A unit of work queued on a BackgroundLoop lane"""
+    
+    def __init__(self, lane, func, args, on_result, on_error):
+        self.lane = lane
+        self.func = func
+        self.args = args
+        self.on_result = on_result
+        self.on_error = on_error
+        self.cancelled = False
+        self._cancel_callbacks = []
+        self._lock = threading.Lock()
+    
+    def cancel(self):
+        """Skip the job if still queued; a running job is told through its cancel callbacks
+        
+        Returns False if the job had already been cancelled.
+        """
+        with self._lock:
+            if self.cancelled:
+                return False
+            self.cancelled = True
+            callbacks, self._cancel_callbacks = self._cancel_callbacks, []
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                print(f"Cancel callback failed: {e}")
+        return True
+    
+    def on_cancel(self, callback):
+        """Register e.g. closing an HTTP response; runs at once if already cancelled"""
+        with self._lock:
+            if not self.cancelled:
+                self._cancel_callbacks.append(callback)
+                return
+        callback()
+
+
+class BackgroundLoop:
+    """Single asyncio event loop on a background thread that schedules the app's jobs
+    
+    Jobs are submitted to named lanes. Each lane runs its jobs one after the
+    other in submission order, while different lanes run concurrently, at
+    most max_concurrency at a time. Job functions are blocking and run on the
+    loop's worker threads; results and errors are handed to dispatch (e.g.
+    a root.after wrapper) so callbacks run on the Tk thread.
+    """
+    
+    def __init__(self, dispatch, max_concurrency=2):
+        self.dispatch = dispatch
+        self.loop = asyncio.new_event_loop()
+        self.loop.set_default_executor(ThreadPoolExecutor(max_workers=max_concurrency,
+                                                          thread_name_prefix="job"))
+        self._lanes = {}
+        self._pending = {}  # lane -> jobs submitted but not finished
+        self._pending_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+    
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.loop.run_forever()
+        finally:
+            self.loop.close()
+    
+    def submit(self, lane, func, *args, on_result=None, on_error=None):
+        """Queue func(job, *args) on a lane and return the Job"""
+        job = Job(lane, func, args, on_result, on_error)
+        with self._pending_lock:
+            self._pending.setdefault(lane, []).append(job)
+        self.loop.call_soon_threadsafe(self._enqueue, job)
+        return job
+    
+    def cancel_lane(self, lane):
+        """Cancel the running and all queued jobs of a lane; returns the jobs cancelled now"""
+        with self._pending_lock:
+            jobs = list(self._pending.get(lane, []))
+        return [job for job in jobs if job.cancel()]
+    
+    def _finished(self, job):
+        with self._pending_lock:
+            self._pending[job.lane].remove(job)
+    
+    def _enqueue(self, job):
+        lane = self._lanes.get(job.lane)
+        if lane is None:
+            lane = self._lanes[job.lane] = asyncio.Queue()
+            self.loop.create_task(self._drain(lane))
+        lane.put_nowait(job)
+    
+    async def _drain(self, lane):
+        while True:
+            job = await lane.get()
+            if not job.cancelled:
+                await self.loop.run_in_executor(None, self._execute, job)
+            self._finished(job)
+    
+    def _execute(self, job):
+        try:
+            result = job.func(job, *job.args)
+        except Exception as e:
+            if job.cancelled:
+                return
+            if job.on_error:
+                self.dispatch(functools.partial(job.on_error, e))
+            else:
+                print(f"Background job on '{job.lane}' failed: {e}")
+            return
+        if job.on_result and not job.cancelled:
+            self.dispatch(functools.partial(job.on_result, result))
+    
+    def close(self):
+        """Cancel all jobs and stop the loop"""
+        with self._pending_lock:
+            lanes = list(self._pending)
+        for lane in lanes:
+            self.cancel_lane(lane)
+        
+        def stop():
+            for task in asyncio.all_tasks(self.loop):
+                task.cancel()
+            # Let the lane tasks handle their cancellation before stopping
+            self.loop.call_soon(self.loop.stop)
+        
+        self.loop.call_soon_threadsafe(stop)
+        self._thread.join(timeout=2)
+
+
+def estimate_tokens(text):
+    """Rough token count (about four characters per token for English-like text)"""
+    return (len(text) + 3) // 4
+
+
+class ContextBuilder:
+    """Fits the system prompt, chat history and new message into a token budget
+    
+    Token counts come from a pluggable tokenizer (text -> count) and are cached
+    per message text. When the history no longer fits, the oldest turns are
+    folded into a rolling summary. Folding goes down to half the free room at
+    once, so the prompt prefix (and the server's prompt cache) stays the same
+    for the following turns.
+    """
+    
+    def __init__(self, context_tokens=8192, reply_tokens=1500, tokenizer=estimate_tokens,
+                 summarize=None, summary_tokens=300, message_overhead=4, cache_size=4096):
+        self.context_tokens = context_tokens
+        self.reply_tokens = reply_tokens
+        self.tokenizer = tokenizer
+        self.summarize = summarize  # summarize(job, turns, previous_summary, max_tokens) -> text
+        self.summary_tokens = summary_tokens
+        self.message_overhead = message_overhead
+        self.cache_size = cache_size
+        self.summary = ""
+        self.summarized = 0  # history messages already folded into the summary
+        self._counts = OrderedDict()
+    
+    @property
+    def prompt_budget(self):
+        return self.context_tokens - self.reply_tokens
+    
+    def count(self, text):
+        count = self._counts.get(text)
+        if count is None:
+            count = self.tokenizer(text)
+            self._counts[text] = count
+            if len(self._counts) > self.cache_size:
+                self._counts.popitem(last=False)
+        else:
+            self._counts.move_to_end(text)
+        return count
+    
+    def message_tokens(self, message):
+        return self.count(message["content"]) + self.message_overhead
+    
+    def fit_text(self, text, max_tokens, marker="\n[...]\n"):
+        """Shorten text to max_tokens by cutting out its middle"""
+        tokens = self.count(text)
+        keep = len(text)
+        while tokens > max_tokens and keep > 0:
+            keep = int(keep * max_tokens / tokens * 0.95)
+            shortened = text[:keep // 2] + marker + text[len(text) - keep // 2:]
+            tokens = self.tokenizer(shortened)
+        return text if keep == len(text) else shortened
+    
+    def reset(self):
+        self.summary = ""
+        self.summarized = 0
+    
+    def build(self, system_prompt, history, message, job=None):
+        """Messages for the next request, within prompt_budget tokens
+        
+        job is handed to the summarizer so cancelling the request also aborts
+        a summary being written for it.
+        """
+        if self.summarized > len(history):
+            self.reset()  # the history was cleared
+        system_tokens = self.count(system_prompt) if system_prompt else 0
+        # The message itself can be a whole transcript ("Use Text"); it gets at
+        # most what the system prompt and the summary leave over
+        message = self.fit_text(message, max(1, self.prompt_budget - system_tokens
+                                             - self.summary_tokens - 2 * self.message_overhead))
+        new = {"role": "user", "content": message}
+        fixed = self.message_tokens(new) + self.message_overhead + system_tokens
+        recent = history[self.summarized:]
+        room = self.prompt_budget - fixed - self.summary_tokens
+        
+        if sum(self.message_tokens(msg) for msg in recent) > room:
+            total = sum(self.message_tokens(msg) for msg in recent)
+            fold = 0
+            while fold < len(recent) - 2 and total > room // 2:
+                total -= self.message_tokens(recent[fold])
+                fold += 1
+            fold += fold % 2  # fold whole user/assistant turns
+            if fold:
+                self.summary = self.fold_into_summary(recent[:fold], job)
+                self.summarized += fold
+                recent = recent[fold:]
+        
+        # A few huge recent messages can still overflow; drop the oldest of them
+        total = sum(self.message_tokens(msg) for msg in recent)
+        while recent and total > room:
+            total -= self.message_tokens(recent[0])
+            recent = recent[1:]
+        
+        system = system_prompt or ""
+        if self.summary:
+            system = f"{system}\n\nSUMMARY OF THE EARLIER CONVERSATION:\n{self.summary}".strip()
+        messages = [{"role": "system", "content": system}] if system else []
+        return messages + list(recent) + [new]
+    
+    def fold_into_summary(self, turns, job=None):
+        """Summarize turns together with the previous summary, falling back to an excerpt"""
+        # Long turns are shortened so the summary request itself stays small
+        turns = [{"role": msg["role"], "content": self.fit_text(msg["content"], self.summary_tokens)}
+                 for msg in turns]
+        if self.summarize is not None:
+            try:
+                return self.fit_text(self.summarize(job, turns, self.summary, self.summary_tokens),
+                                     self.summary_tokens)
+            except Exception as e:
+                if job is not None and job.cancelled:
+                    # Leave summary and summarized alone; the next request summarizes again
+                    raise
+                print(f"Summarizing earlier turns failed ({e}); keeping an excerpt instead")
+        lines = [self.summary] if self.summary else []
+        lines += [f"{msg['role']}: {(msg['content'].splitlines() or [''])[0][:200]}" for msg in turns]
+        return self.fit_text("\n".join(lines), self.summary_tokens)
+
+
+def iter_sse_deltas(lines):
+    """Yield the content deltas of an OpenAI-compatible server-sent event stream"""
+    for line in lines:
+        if isinstance(line, bytes):
+            line = line.decode('utf-8')
+        if not line.startswith("data:"):
+            continue
+        payload = line[5:].strip()
+        if payload == "[DONE]":
+            return
+        chunk = json.loads(payload)
+        if "error" in chunk:
+            raise RuntimeError(f"Server error: {chunk['error']}")
+        for choice in chunk.get("choices", []):
+            text = (choice.get("delta") or {}).get("content")
+            if text:
+                yield text
+
+
+class TokenBatcher:
+    """Collects streamed tokens from a worker thread and hands them to the UI in batches"""
+    
+    def __init__(self, flush, schedule, interval_ms=50):
+        self.flush = flush        # called on the UI thread with the batched text
+        self.schedule = schedule  # e.g. root.after
+        self.interval_ms = interval_ms
+        self._pending = []
+        self._scheduled = False
+        self._lock = threading.Lock()
+    
+    def add(self, text):
+        with self._lock:
+            self._pending.append(text)
+            if self._scheduled:
+                return
+            self._scheduled = True
+        self.schedule(self.interval_ms, self._flush)
+    
+    def _flush(self):
+        with self._lock:
+            text = "".join(self._pending)
+            self._pending = []
+            self._scheduled = False
+        if text:
+            self.flush(text)
+
 
 class AIVoiceAssistant:
-    def __init__(self, root):
+    def __init__(self, root, startup=None):
         self.root = root
+        self.startup = startup or StartupTimer()
         self.root.title("AI Voice Assistant")
         self.root.geometry("1200x900")
         
@@ -38,32 +1916,116 @@ class AIVoiceAssistant:
         
         # Audio recording variables
         self.is_recording = False
-        self.audio_frames = []
-        self.audio_stream = None
-        self.p = pyaudio.PyAudio()
+        self.capture_buffer = None
+        self.capture_engine = None
+        self.long_recording = None
+        self.recordings_dir = os.path.join(os.path.expanduser("~"), "AI Voice Assistant Recordings")
+        self.spill_flush_seconds = 5
+        self.last_spill_flush = 0.0
+        self.long_recording_window_seconds = 300
+        self.audio_array = None
+        self.p = None  # created by load_audio_system
         
         # Whisper model
-        self.whisper_model = None
+        self.default_model = "base"
+        self.default_profile = "balanced"
+        self.language_tracker = LanguageTracker()
+        self.decoded_audio_cache = DecodedAudioCache(os.path.join(os.path.expanduser("~"), ".cache",
+                                                                  "ai-voice-assistant", "decoded"),
+                                                     max_mb=2048)
+        self.transcript_cache = TranscriptCache(os.path.join(os.path.expanduser("~"), ".cache",
+                                                             "ai-voice-assistant", "transcripts.sqlite3"),
+                                                max_mb=256)
+        self.model_store_dir = (os.environ.get("AI_VOICE_ASSISTANT_MODEL_DIR")
+                                or os.path.join(os.path.expanduser("~"), ".cache",
+                                                "ai-voice-assistant", "models"))
+        self.model_store = LocalModelStore(self.model_store_dir)
+        self.model_ram_budget_mb = 3072
+        self.model_idle_minutes = 10
+        self.model_manager = WhisperModelManager(self.load_model_weights,
+                                                 ram_budget_mb=self.model_ram_budget_mb,
+                                                 idle_minutes=self.model_idle_minutes,
+                                                 size_of=self.model_memory_bytes)
         self.model_loaded = False
+        self.transcribe_lock = threading.Lock()
+        
+        # Inference tuning: warm up new models and keep cores free for the UI/capture
+        self.warm_up_models = True
+        self.reserved_cores = 2
+        self.inference_threads = max(1, (os.cpu_count() or 2) - self.reserved_cores)
+        self.interop_threads = 1
+        self.inference_stats = InferenceStats()
+        
+        # Long files are split at pauses and transcribed by several worker processes
+        self.parallel_min_seconds = 600
+        self.parallel_chunk_seconds = 120
+        self.parallel_threads_per_worker = 4
+        self.parallel_workers = max(1, self.inference_threads // self.parallel_threads_per_worker)
+        
+        # Speech-recognition engines; asr_engine picks the one used for transcription
+        # and can be set with AI_VOICE_ASSISTANT_ASR_ENGINE (e.g. "faster-whisper")
+        self.asr_backends = {
+            WhisperBackend.name: WhisperBackend(self.model_store),
+            FasterWhisperBackend.name: FasterWhisperBackend(
+                os.path.join(self.model_store_dir, "faster-whisper"),
+                cpu_threads=self.inference_threads),
+        }
+        self.asr_engine = os.environ.get("AI_VOICE_ASSISTANT_ASR_ENGINE", WhisperBackend.name)
+        if self.asr_engine not in self.asr_backends:
+            print(f"Unknown ASR engine '{self.asr_engine}'; using {WhisperBackend.name}")
+            self.asr_engine = WhisperBackend.name
+        self.streaming_transcriber = None
+        
+        # Hands-free mode: utterances flow capture -> ASR worker -> LLM
+        self.continuous_mode = False
+        self.utterance_segmenter = None
+        self.utterance_queue = None
         
         # LM Studio settings
         self.lm_studio_url = "http://localhost:1234/v1/chat/completions"
         self.api_key = "lm-studio"
+        self.stream_responses = True
+        self.supersede_responses = True  # a typed question aborts the answer in progress
+        self.context_builder = ContextBuilder(context_tokens=8192, reply_tokens=1500,
+                                              summarize=self.summarize_turns)
+        self.stream_idle_timeout = 60  # seconds without a token before giving up
+        self.lm_client = LMStudioClient(self.api_key, read_timeout=self.stream_idle_timeout)
+        
+        # One asyncio loop runs transcription and LM Studio jobs in ordered lanes
+        self.background = BackgroundLoop(lambda callback: self.root.after(0, callback),
+                                         max_concurrency=3)
         
         # Audio settings
         self.chunk = 1024
-        self.format = pyaudio.paInt16
+        self.format = PA_INT16
         self.channels = 1
-        self.rate = 44100
-        
-        # Conversation context
+        self.rate = WHISPER_SAMPLE_RATE  # rate of the stored recording
+        self.device_rate = None  # rate negotiated with the input device
+        self.resampler = None
+        self.input_devices = []
+        # One Tk poll drains capture and refreshes the level meter at a capped rate
+        self.meter_fps = 15
+        self.capture_poll_ms = 1000 // self.meter_fps
+        self.clipped_samples = 0
+        
+        # Conversation context; the history is only read and written by chat jobs,
+        # which start it afresh when context_generation moves past history_generation
         self.conversation_history = []
+        self.context_generation = 0
+        self.history_generation = 0
         self.current_transcription = ""
         self.transcription_in_context = False
         
-        # Initialize UI directly
+        # Show the UI first; audio and Whisper come up in the background
+        self.pending_subsystems = {"audio", "whisper"}
+        self.failed_subsystems = {}  # name -> error message
+        ui_started = time.perf_counter()
         self.setup_dark_theme()
         self.setup_ui()
+        self.startup.record("ui", ui_started)
+        self.root.after_idle(lambda: self.startup.record("window shown"))
+        
+        self.load_audio_system()
         self.load_whisper_model()
         
         print("AIVoiceAssistant initialized successfully")
@@ -203,7 +2165,32 @@ class AIVoiceAssistant:
         ttk.Button(controls_frame, 
                   text="📁 Load File", 
                   style="Dark.TButton",
-                  command=self.load_audio_file).pack(side=tk.LEFT)
+                  command=self.load_audio_file).pack(side=tk.LEFT, padx=(0, 10))
+        
+        self.handsfree_button = ttk.Button(controls_frame,
+                                          text="🎧 Hands-free",
+                                          style="Dark.TButton",
+                                          command=self.toggle_continuous_mode)
+        self.handsfree_button.pack(side=tk.LEFT)
+        
+        # Input device selection
+        device_frame = tk.Frame(recording_frame, bg=self.colors['surface'])
+        device_frame.pack(fill=tk.X, padx=10, pady=(0, 8))
+        
+        tk.Label(device_frame,
+                text="Input:",
+                font=('Segoe UI', 9, 'bold'),
+                bg=self.colors['surface'],
+                fg=self.colors['text']).pack(side=tk.LEFT, padx=(0, 8))
+        
+        # Filled in by load_audio_system once PyAudio is up
+        self.device_var = tk.StringVar(value="Default device")
+        self.device_combo = ttk.Combobox(device_frame,
+                                        textvariable=self.device_var,
+                                        values=["Default device"],
+                                        state="readonly",
+                                        font=('Segoe UI', 9))
+        self.device_combo.pack(side=tk.LEFT, fill=tk.X, expand=True)
         
         # Recording status
         self.recording_status = tk.Label(recording_frame,
@@ -212,6 +2199,61 @@ class AIVoiceAssistant:
                                         bg=self.colors['surface'],
                                         fg=self.colors['text_secondary'])
         self.recording_status.pack(anchor=tk.W, padx=10, pady=(0, 10))
+        
+        # Input level meter
+        meter_frame = tk.Frame(recording_frame, bg=self.colors['surface'])
+        meter_frame.pack(fill=tk.X, padx=10, pady=(0, 10))
+        
+        self.level_meter = tk.Canvas(meter_frame,
+                                     width=220,
+                                     height=10,
+                                     bg=self.colors['surface_light'],
+                                     highlightthickness=0)
+        self.level_meter.pack(side=tk.LEFT, padx=(0, 8))
+        self.level_bar = self.level_meter.create_rectangle(0, 0, 0, 10, width=0,
+                                                           fill=self.colors['success'])
+        self.peak_marker = self.level_meter.create_line(0, 0, 0, 10, fill=self.colors['text'])
+        
+        self.level_label = tk.Label(meter_frame,
+                                    text="-∞ dB",
+                                    font=('Segoe UI', 8),
+                                    bg=self.colors['surface'],
+                                    fg=self.colors['text_muted'])
+        self.level_label.pack(side=tk.LEFT)
+        
+        # Recordings are transcribed from memory; a WAV copy is optional
+        self.keep_wav_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(recording_frame,
+                      text="Keep WAV copy of recordings",
+                      variable=self.keep_wav_var,
+                      bg=self.colors['surface'],
+                      fg=self.colors['text'],
+                      selectcolor=self.colors['surface_light'],
+                      activebackground=self.colors['surface'],
+                      activeforeground=self.colors['text'],
+                      font=('Segoe UI', 9)).pack(anchor=tk.W, padx=10, pady=(0, 4))
+        
+        self.spill_to_disk_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(recording_frame,
+                      text="Long session (record to disk)",
+                      variable=self.spill_to_disk_var,
+                      bg=self.colors['surface'],
+                      fg=self.colors['text'],
+                      selectcolor=self.colors['surface_light'],
+                      activebackground=self.colors['surface'],
+                      activeforeground=self.colors['text'],
+                      font=('Segoe UI', 9)).pack(anchor=tk.W, padx=10, pady=(0, 4))
+        
+        self.live_transcribe_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(recording_frame,
+                      text="Live transcription while recording",
+                      variable=self.live_transcribe_var,
+                      bg=self.colors['surface'],
+                      fg=self.colors['text'],
+                      selectcolor=self.colors['surface_light'],
+                      activebackground=self.colors['surface'],
+                      activeforeground=self.colors['text'],
+                      font=('Segoe UI', 9)).pack(anchor=tk.W, padx=10, pady=(0, 10))
     
     def setup_settings_section(self, parent):
         settings_frame = self.create_section_frame(parent, "⚙️ LM Studio")
@@ -274,6 +2316,8 @@ class AIVoiceAssistant:
         scrollbar_trans = ttk.Scrollbar(text_frame, orient=tk.VERTICAL, command=self.transcription_text.yview)
         self.transcription_text.configure(yscrollcommand=scrollbar_trans.set)
         
+        self.transcription_text.tag_configure("partial", foreground=self.colors['text_muted'])
+        
         self.transcription_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(0, 5))
         scrollbar_trans.pack(side=tk.RIGHT, fill=tk.Y)
         
@@ -291,6 +2335,55 @@ class AIVoiceAssistant:
                   text="🗑️ Clear", 
                   style="Dark.TButton",
                   command=self.clear_transcription).pack(side=tk.LEFT)
+        
+        self.model_var = tk.StringVar(value=self.default_model)
+        ttk.Combobox(trans_controls,
+                    textvariable=self.model_var,
+                    values=WHISPER_MODEL_SIZES,
+                    state="readonly",
+                    width=8,
+                    font=('Segoe UI', 9)).pack(side=tk.RIGHT, padx=(10, 0))
+        
+        self.profile_var = tk.StringVar(value=self.default_profile)
+        ttk.Combobox(trans_controls,
+                    textvariable=self.profile_var,
+                    values=list(DECODING_PROFILES),
+                    state="readonly",
+                    width=9,
+                    font=('Segoe UI', 9)).pack(side=tk.RIGHT, padx=(10, 0))
+        
+        # Dynamic int8 quantization of the selected model (CPU only)
+        self.quantize_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(trans_controls,
+                      text="int8",
+                      variable=self.quantize_var,
+                      bg=self.colors['surface'],
+                      fg=self.colors['text'],
+                      selectcolor=self.colors['surface_light'],
+                      activebackground=self.colors['surface'],
+                      activeforeground=self.colors['text'],
+                      font=('Segoe UI', 9)).pack(side=tk.RIGHT, padx=(10, 0))
+        
+        # "auto" detects once per session; a language code pins it
+        self.language_var = tk.StringVar(value="auto")
+        self.language_var.trace_add("write", lambda *args: self.pin_language())
+        ttk.Combobox(trans_controls,
+                    textvariable=self.language_var,
+                    values=["auto", "en", "sv", "de", "fr", "es"],
+                    state="readonly",
+                    width=5,
+                    font=('Segoe UI', 9)).pack(side=tk.RIGHT, padx=(10, 0))
+        
+        self.trim_silence_var = tk.BooleanVar(value=True)
+        tk.Checkbutton(trans_controls,
+                      text="Trim silence",
+                      variable=self.trim_silence_var,
+                      bg=self.colors['surface'],
+                      fg=self.colors['text'],
+                      selectcolor=self.colors['surface_light'],
+                      activebackground=self.colors['surface'],
+                      activeforeground=self.colors['text'],
+                      font=('Segoe UI', 9)).pack(side=tk.RIGHT)
     
     def setup_chat_section(self, parent):
         chat_frame = self.create_section_frame(parent, "💬 AI Conversation")
@@ -370,6 +2463,11 @@ class AIVoiceAssistant:
                   style="Dark.TButton",
                   command=self.clear_chat).pack(side=tk.LEFT, padx=(0, 10))
         
+        ttk.Button(chat_controls,
+                  text="⏹️ Stop",
+                  style="Dark.TButton",
+                  command=self.stop_ai_response).pack(side=tk.LEFT, padx=(0, 10))
+        
         # Auto-analyze toggle
         self.auto_transcribe_var = tk.BooleanVar(value=True)
         auto_check = tk.Checkbutton(chat_controls,
@@ -411,22 +2509,153 @@ class AIVoiceAssistant:
                                     fg=self.colors['warning'],
                                     font=('Segoe UI', 9))
         self.model_status.pack(side=tk.RIGHT)
+        
+        # Audio subsystem status
+        self.audio_status = tk.Label(status_content,
+                                    text="🔄 Starting audio...",
+                                    bg=self.colors['surface_dark'],
+                                    fg=self.colors['warning'],
+                                    font=('Segoe UI', 9))
+        self.audio_status.pack(side=tk.RIGHT, padx=(0, 15))
+        
+        # First-call vs steady-state transcription latency
+        self.latency_status = tk.Label(status_content,
+                                      text="",
+                                      bg=self.colors['surface_dark'],
+                                      fg=self.colors['text_muted'],
+                                      font=('Segoe UI', 9))
+        self.latency_status.pack(side=tk.RIGHT, padx=(0, 15))
 
-    # All the method implementations from before...
+    def subsystem_ready(self, name, error=None):
+        """Mark a background subsystem as started (or failed, with error) and report
+        timings once none is pending; failures stay in the status bar"""
+        self.pending_subsystems.discard(name)
+        if error is not None:
+            self.failed_subsystems[name] = error
+        if not self.pending_subsystems:
+            report = self.startup.report()
+            print(f"Startup timing: {report}")
+            if self.failed_subsystems:
+                errors = "; ".join(f"{failed}: {message}"
+                                   for failed, message in self.failed_subsystems.items())
+                self.status_var.set(f"❌ Startup failed ({errors}) - startup: {report}")
+            else:
+                self.status_var.set(f"🟢 Ready - startup: {report}")
+    
+    def load_audio_system(self):
+        """Import PyAudio and open the audio host API in a separate thread"""
+        def load_audio():
+            try:
+                started = time.perf_counter()
+                import_pyaudio()
+                self.startup.record("pyaudio import", started)
+                
+                started = time.perf_counter()
+                self.p = pyaudio.PyAudio()
+                devices = list_input_devices(self.p)
+                self.startup.record("audio init", started)
+                self.root.after(0, lambda: self.on_audio_ready(devices))
+            except Exception as e:
+                error = str(e)
+                self.root.after(0, lambda: self.on_audio_failed(error))
+        
+        threading.Thread(target=load_audio, daemon=True).start()
+    
+    def on_audio_ready(self, devices):
+        """Populate the device list once the audio subsystem is up"""
+        self.input_devices = devices
+        self.device_combo.config(values=["Default device"] + [name for _, name, _ in devices])
+        self.audio_status.config(text="✅ Audio Ready", fg=self.colors['success'])
+        self.subsystem_ready("audio")
+    
+    def on_audio_failed(self, error):
+        self.audio_status.config(text="❌ Audio Failed", fg=self.colors['error'])
+        self.status_var.set(f"❌ Error starting audio: {error}")
+        self.subsystem_ready("audio", error)
+    
     def load_whisper_model(self):
-        """Load Whisper model in a separate thread"""
+        """Import Whisper and load the model in a separate thread"""
         def load_model():
+            error = None
             try:
-                self.model_status.config(text="🔄 Loading Whisper...", fg=self.colors['warning'])
-                self.whisper_model = whisper.load_model("base")
+                self.root.after(0, lambda: self.model_status.config(text="🔄 Loading Whisper...",
+                                                                    fg=self.colors['warning']))
+                started = time.perf_counter()
+                import_whisper()
+                self.startup.record("whisper import", started)
+                configure_torch_threads(self.inference_threads, self.interop_threads)
+                
+                started = time.perf_counter()
+                self.model_manager.get(self.model_key(self.default_model))
+                self.startup.record("model load", started)
                 self.model_loaded = True
-                self.model_status.config(text="✅ Whisper Ready", fg=self.colors['success'])
-                self.status_var.set("🟢 Ready - Whisper model loaded")
+                self.root.after(0, self.update_model_status)
+                self.post_status("🟢 Ready - Whisper model loaded")
             except Exception as e:
-                self.model_status.config(text="❌ Whisper Failed", fg=self.colors['error'])
-                self.status_var.set(f"❌ Error loading Whisper: {str(e)}")
+                self.root.after(0, lambda: self.model_status.config(text="❌ Whisper Failed",
+                                                                    fg=self.colors['error']))
+                self.post_status(f"❌ Error loading Whisper: {str(e)}")
+                error = str(e)
+            self.root.after(0, lambda: self.subsystem_ready("whisper", error))
         
         threading.Thread(target=load_model, daemon=True).start()
+        self.root.after(60000, self.unload_idle_models)
+    
+    def load_model_weights(self, key):
+        """Loader used by the model manager; loads through the key's engine and warms the model up"""
+        engine, name = split_model_key(key)
+        backend = self.asr_backends[engine]
+        model = backend.load(name)
+        
+        if self.warm_up_models:
+            started = time.perf_counter()
+            backend.warm_up(model)
+            self.inference_stats.record_warm_up(key, time.perf_counter() - started)
+            self.root.after(0, lambda: self.update_latency_status(key))
+        return model
+    
+    def model_memory_bytes(self, key, model):
+        engine, name = split_model_key(key)
+        return self.asr_backends[engine].memory_bytes(name, model)
+    
+    def model_key(self, name):
+        """Model-manager key for a model name on the current engine"""
+        if self.asr_engine == WhisperBackend.name:
+            return name
+        return f"{self.asr_engine}:{name}"
+    
+    def selected_model_name(self):
+        """Model-manager key for the chosen engine, model size and precision"""
+        name = self.model_var.get()
+        if self.quantize_var.get():
+            name += QUANTIZED_SUFFIX
+        return self.model_key(name)
+    
+    def pin_language(self):
+        language = self.language_var.get().strip().lower()
+        self.language_tracker.pin(None if language in ("", "auto") else language)
+    
+    def post_status(self, text):
+        """Show text in the status bar from any thread; Tk variables belong to the Tk thread"""
+        self.root.after(0, lambda: self.status_var.set(text))
+    
+    def update_latency_status(self, model_name):
+        self.latency_status.config(text=self.inference_stats.summary(model_name))
+    
+    def update_model_status(self):
+        """Show which Whisper models are resident"""
+        loaded = self.model_manager.loaded()
+        if loaded:
+            self.model_status.config(text=f"✅ Whisper: {', '.join(loaded)}", fg=self.colors['success'])
+        else:
+            self.model_status.config(text="💤 Whisper: no model loaded", fg=self.colors['text_muted'])
+    
+    def unload_idle_models(self):
+        """Periodically release models that have not been used for a while"""
+        for name in self.model_manager.unload_idle():
+            print(f"Unloaded idle Whisper model '{name}'")
+        self.update_model_status()
+        self.root.after(60000, self.unload_idle_models)
     
     def toggle_recording(self):
         """Start or stop audio recording"""
@@ -435,70 +2664,298 @@ class AIVoiceAssistant:
         else:
             self.stop_recording()
     
-    def start_recording(self):
+    def toggle_continuous_mode(self):
+        """Start or stop hands-free listening"""
+        if self.is_recording:
+            if self.continuous_mode:
+                self.stop_recording()
+            return
+        
+        if not self.model_loaded:
+            messagebox.showerror("Model Error", "Whisper model not loaded yet. Please wait.")
+            return
+        
+        self.start_recording(continuous=True)
+    
+    def start_recording(self, continuous=False):
         """Start recording audio"""
+        if self.p is None:
+            messagebox.showinfo("Audio Starting", "The audio system is still starting. Please wait.")
+            return
+        
         try:
-            self.audio_frames = []
-            self.audio_stream = self.p.open(
-                format=self.format,
-                channels=self.channels,
-                rate=self.rate,
-                input=True,
-                frames_per_buffer=self.chunk
-            )
+            device_index = self.selected_input_device()
+            self.device_rate = negotiate_input_rate(self.p, device_index,
+                                                    self.format, self.channels,
+                                                    preferred=self.rate)
+            # Resample on the fly so the stored recording is already model-native
+            if self.device_rate != self.rate:
+                self.resampler = StreamingResampler(self.device_rate, self.rate)
+            else:
+                self.resampler = None
+            
+            if self.spill_to_disk_var.get():
+                os.makedirs(self.recordings_dir, exist_ok=True)
+                path = os.path.join(self.recordings_dir,
+                                    datetime.now().strftime("recording-%Y%m%d-%H%M%S.wav"))
+                self.capture_buffer = SpillingCaptureBuffer(path, self.rate, self.channels)
+            else:
+                self.capture_buffer = CaptureBuffer(self.rate, self.channels)
+            self.capture_engine = CaptureEngine(self.p, self.format, self.channels,
+                                                self.device_rate, self.chunk,
+                                                input_device_index=device_index)
+            self.capture_engine.start()
+            print(f"Capturing at {self.device_rate} Hz, storing at {self.rate} Hz")
             
+            self.continuous_mode = continuous
+            if continuous:
+                self.utterance_segmenter = UtteranceSegmenter(self.rate)
+                self.utterance_queue = queue.Queue()
+                threading.Thread(target=self.process_utterances,
+                                 args=(self.rate, self.utterance_queue,
+                                       self.selected_model_name(), self.profile_var.get()),
+                                 daemon=True).start()
+            
+            if self.live_transcribe_var.get() and self.model_loaded and not continuous:
+                self.transcription_text.delete(1.0, tk.END)
+                transcribe = functools.partial(self.transcribe_audio, model_name=self.selected_model_name(),
+                                               profile=self.profile_var.get())
+                self.streaming_transcriber = StreamingTranscriber(transcribe,
+                                                                  self.capture_buffer,
+                                                                  self.on_live_transcript)
+                self.streaming_transcriber.start()
+            else:
+                self.streaming_transcriber = None
+            
+            self.clipped_samples = 0
             self.is_recording = True
-            self.record_button.config(text="⏹️ Stop Recording")
-            self.recording_status.config(text="🔴 Recording in progress...", fg=self.colors['error'])
-            self.status_var.set("🔴 Recording audio...")
+            if continuous:
+                self.handsfree_button.config(text="⏹️ Stop Listening")
+                self.record_button.config(state="disabled")
+                self.recording_status.config(text="🎧 Listening hands-free...", fg=self.colors['error'])
+                self.status_var.set("🎧 Hands-free mode - speak, pause to send")
+            else:
+                self.record_button.config(text="⏹️ Stop Recording")
+                self.recording_status.config(text="🔴 Recording in progress...", fg=self.colors['error'])
+                self.status_var.set("🔴 Recording audio...")
             
-            threading.Thread(target=self.record_audio, daemon=True).start()
+            self.root.after(self.capture_poll_ms, self.poll_capture)
             
         except Exception as e:
             messagebox.showerror("Recording Error", f"Failed to start recording: {str(e)}")
     
-    def record_audio(self):
-        """Record audio data"""
-        while self.is_recording:
+    def selected_input_device(self):
+        """Return the PyAudio index of the chosen input device (None for default)"""
+        for index, name, _ in self.input_devices:
+            if name == self.device_var.get():
+                return index
+        return None
+    
+    def poll_capture(self):
+        """Move captured blocks into the recording buffer (runs on the Tk loop)"""
+        if not self.is_recording:
+            return
+        
+        blocks = self.drain_capture()
+        self.update_level_meter(blocks)
+        if self.streaming_transcriber is not None:
+            self.streaming_transcriber.notify()
+        if self.continuous_mode:
+            self.segment_utterances()
+        if (isinstance(self.capture_buffer, SpillingCaptureBuffer)
+                and time.monotonic() - self.last_spill_flush >= self.spill_flush_seconds):
+            self.capture_buffer.flush()
+            self.last_spill_flush = time.monotonic()
+        overflows = self.capture_engine.overflows
+        if overflows:
+            self.recording_status.config(
+                text=f"🔴 Recording in progress... ({overflows} input overflows)",
+                fg=self.colors['error'])
+        
+        self.root.after(self.capture_poll_ms, self.poll_capture)
+    
+    def drain_capture(self):
+        """Append every pending captured block to the recording buffer"""
+        blocks = self.capture_engine.drain()
+        for block in blocks:
+            if self.resampler is not None:
+                block = self.resampler.process_pcm16(block)
+            self.capture_buffer.append(block)
+        return blocks
+    
+    def update_level_meter(self, blocks):
+        """Show RMS, peak and clipping for the raw blocks drained since the last poll"""
+        if blocks is None:
+            rms_db, peak_db, clipped = -96.0, -96.0, 0
+        else:
+            if not blocks:
+                return
+            samples = np.frombuffer(b''.join(blocks), dtype=np.int16)
+            rms_db, peak_db, clipped = compute_input_levels(samples)
+            self.clipped_samples += clipped
+        
+        # Map -60..0 dBFS onto the meter width
+        width = int(self.level_meter.cget('width'))
+        rms_x = width * min(1.0, max(0.0, (rms_db + 60) / 60))
+        peak_x = width * min(1.0, max(0.0, (peak_db + 60) / 60))
+        if clipped:
+            color = self.colors['error']
+        elif peak_db > -6:
+            color = self.colors['warning']
+        else:
+            color = self.colors['success']
+        self.level_meter.coords(self.level_bar, 0, 0, rms_x, 10)
+        self.level_meter.itemconfigure(self.level_bar, fill=color)
+        self.level_meter.coords(self.peak_marker, peak_x, 0, peak_x, 10)
+        
+        text = f"{rms_db:.0f} dB" if rms_db > -96 else "-∞ dB"
+        if self.clipped_samples:
+            text += f" • {self.clipped_samples} clipped"
+        self.level_label.config(text=text)
+    
+    def segment_utterances(self):
+        """Queue every utterance completed by newly captured audio for transcription"""
+        new_samples = self.capture_buffer.samples(self.utterance_segmenter.position)
+        for start, end in self.utterance_segmenter.process(new_samples):
+            self.utterance_queue.put(self.capture_buffer.samples(start, end).copy())
+        self.release_consumed_audio()
+    
+    def release_consumed_audio(self):
+        """Let the in-memory buffer drop audio no utterance can reach any more
+        
+        Hands-free sessions may run for hours; the spill buffer already keeps
+        RAM flat, the in-memory one has to forget what it has handed out.
+        """
+        if isinstance(self.capture_buffer, CaptureBuffer):
+            self.capture_buffer.discard(self.utterance_segmenter.retain_from)
+    
+    def process_utterances(self, rate, utterances, model_name, profile=None):
+        """ASR worker for hands-free mode; the LLM call for one utterance overlaps
+        with transcription of the next and with ongoing capture"""
+        while True:
+            samples = utterances.get()
+            if samples is None:
+                return
             try:
-                data = self.audio_stream.read(self.chunk)
-                self.audio_frames.append(data)
+                audio = pcm16_to_float32(samples, rate)
+                text = self.transcribe_audio(audio, model_name, profile)["text"].strip()
+                if text:
+                    self.root.after(0, lambda text=text: self.send_voice_message(text))
             except Exception as e:
-                print(f"Recording error: {e}")
-                break
+                print(f"Hands-free transcription error: {e}")
+    
+    def send_voice_message(self, text):
+        """Send a hands-free utterance to the AI"""
+        self.add_to_chat(f"🎤 You: {text}", "user")
+        self.get_ai_response(text)
     
     def stop_recording(self):
         """Stop recording audio"""
         self.is_recording = False
         
-        if self.audio_stream:
-            self.audio_stream.stop_stream()
-            self.audio_stream.close()
+        if self.capture_engine:
+            self.capture_engine.stop()
+            self.drain_capture()
+        self.update_level_meter(None)
+        
+        if self.continuous_mode:
+            self.segment_utterances()
+            for start, end in self.utterance_segmenter.flush():
+                self.utterance_queue.put(self.capture_buffer.samples(start, end).copy())
+            self.utterance_queue.put(None)
+            if isinstance(self.capture_buffer, SpillingCaptureBuffer):
+                if len(self.capture_buffer):
+                    self.capture_buffer.close()
+                else:
+                    self.capture_buffer.delete()
+            self.continuous_mode = False
+            self.handsfree_button.config(text="🎧 Hands-free")
+            self.record_button.config(state="normal")
+            self.recording_status.config(text="✅ Hands-free session ended", fg=self.colors['success'])
+            self.status_var.set("🟢 Ready")
+            return
         
         self.record_button.config(text="🔴 Start Recording")
         self.recording_status.config(text="✅ Recording completed", fg=self.colors['success'])
         
-        if self.audio_frames:
+        if self.capture_engine and self.capture_engine.overflows:
+            self.status_var.set(f"⚠️ Recording completed with {self.capture_engine.overflows} input overflows")
+        
+        live, self.streaming_transcriber = self.streaming_transcriber, None
+        if self.capture_buffer is not None and len(self.capture_buffer):
             self.save_recording()
+            if live is not None and live.error is None:
+                # Only the audio after the last finalized window is left to decode
+                self.status_var.set("🎯 Finishing live transcription...")
+                live.finish(self.on_live_transcription_finished)
+                return
+            if live is not None:
+                self.status_var.set(f"⚠️ Live transcription failed: {live.error}")
             if self.auto_transcribe_var.get():
                 self.transcribe_and_send()
+        elif isinstance(self.capture_buffer, SpillingCaptureBuffer):
+            # Stopped before any audio arrived: leave no empty WAV behind
+            self.capture_buffer.delete()
+        if live is not None:
+            live.close()
+    
+    def on_live_transcript(self, final_text, partial_text):
+        """Show finalized and partial live transcription (called from the worker)"""
+        def update():
+            self.transcription_text.delete(1.0, tk.END)
+            self.transcription_text.insert(tk.END, final_text)
+            if partial_text:
+                self.transcription_text.insert(tk.END, f" {partial_text}", "partial")
+            self.transcription_text.see(tk.END)
+        
+        self.root.after(0, update)
+    
+    def on_live_transcription_finished(self, text):
+        """Hand the completed live transcript to the normal transcript flow"""
+        self.root.after(0, lambda: self.handle_transcription(text))
     
     def save_recording(self):
-        """Save the recorded audio to a temporary file"""
+        """Convert the recorded audio for Whisper and optionally keep a WAV copy"""
         try:
-            self.temp_audio_file = tempfile.NamedTemporaryFile(delete=False, suffix=".wav")
+            if isinstance(self.capture_buffer, SpillingCaptureBuffer):
+                # The spill file already is the WAV; transcription reads windows from it
+                self.capture_buffer.close()
+                self.audio_array = None
+                self.long_recording = self.capture_buffer
+                self.transcribe_button.config(state="normal")
+                self.status_var.set(f"💾 Recording saved to {self.capture_buffer.path}")
+                return
+            
+            self.long_recording = None
+            pcm = self.capture_buffer.view()
+            self.audio_array = pcm16_to_float32(pcm, self.rate, self.channels)
+            
+            if self.keep_wav_var.get():
+                threading.Thread(target=self.write_wav_copy, args=(pcm,), daemon=True).start()
+            
+            self.transcribe_button.config(state="normal")
             
-            wf = wave.open(self.temp_audio_file.name, 'wb')
+        except Exception as e:
+            messagebox.showerror("Save Error", f"Failed to save recording: {str(e)}")
+    
+    def write_wav_copy(self, pcm):
+        """Write the raw recording as a WAV file in the recordings folder (runs in the background)"""
+        try:
+            os.makedirs(self.recordings_dir, exist_ok=True)
+            path = os.path.join(self.recordings_dir,
+                                datetime.now().strftime("recording-%Y%m%d-%H%M%S.wav"))
+            
+            wf = wave.open(path, 'wb')
             wf.setnchannels(self.channels)
             wf.setsampwidth(self.p.get_sample_size(self.format))
             wf.setframerate(self.rate)
-            wf.writeframes(b''.join(self.audio_frames))
+            wf.writeframes(pcm)
             wf.close()
             
-            self.transcribe_button.config(state="normal")
-            
+            print(f"Recording saved to {path}")
+            self.post_status(f"💾 Recording saved to {path}")
         except Exception as e:
-            messagebox.showerror("Save Error", f"Failed to save recording: {str(e)}")
+            print(f"Failed to write WAV copy: {e}")
     
     def load_audio_file(self):
         """Load an audio file for transcription"""
@@ -511,9 +2968,22 @@ class AIVoiceAssistant:
         )
         
         if file_path:
+            self.audio_array = None
+            self.long_recording = None
             self.temp_audio_file = type('obj', (object,), {'name': file_path})()
             self.transcribe_button.config(state="normal")
             self.recording_status.config(text=f"📁 Loaded: {os.path.basename(file_path)}", fg=self.colors['success'])
+            threading.Thread(target=self.decode_audio_file, args=(file_path,), daemon=True).start()
+    
+    def decode_audio_file(self, file_path):
+        """Decode a chosen file into the PCM cache ahead of the first transcription"""
+        try:
+            started = time.perf_counter()
+            self.decoded_audio_cache.load(file_path)
+            print(f"Decoded {os.path.basename(file_path)} in {time.perf_counter() - started:.1f}s")
+        except Exception as e:
+            # Transcription decodes again and reports the error
+            print(f"Background decode of {file_path} failed: {e}")
     
     def transcribe_and_send(self):
         """Transcribe audio and automatically send to AI"""
@@ -521,44 +2991,191 @@ class AIVoiceAssistant:
             messagebox.showerror("Model Error", "Whisper model not loaded yet. Please wait.")
             return
         
-        if not hasattr(self, 'temp_audio_file'):
+        if (self.audio_array is None and self.long_recording is None
+                and not hasattr(self, 'temp_audio_file')):
             messagebox.showerror("Audio Error", "No audio file to transcribe.")
             return
         
-        def process():
-            try:
-                self.status_var.set("🎯 Transcribing audio...")
-                self.transcribe_button.config(state="disabled")
-                
-                result = self.whisper_model.transcribe(self.temp_audio_file.name)
-                transcribed_text = result["text"].strip()
-                
-                if transcribed_text:
-                    self.current_transcription = transcribed_text
-                    
-                    self.transcription_text.delete(1.0, tk.END)
-                    self.transcription_text.insert(1.0, transcribed_text)
-                    
-                    self.add_transcription_to_context()
-                    
-                    if self.auto_transcribe_var.get():
-                        self.status_var.set("🤖 Requesting initial analysis...")
-                        initial_prompt = "Please provide a brief summary of this transcript and identify the main topics or key points discussed."
-                        self.add_to_chat(f"🎤 Auto-analysis request: {initial_prompt}", "user")
-                        self.get_ai_response(initial_prompt)
-                    else:
-                        self.status_var.set("✅ Transcription completed - Ready for questions")
-                else:
-                    self.status_var.set("⚠️ No speech detected in audio")
-                
-                self.transcribe_button.config(state="normal")
-                
-            except Exception as e:
-                self.status_var.set("❌ Transcription failed")
-                self.transcribe_button.config(state="normal")
-                messagebox.showerror("Transcription Error", f"Failed to transcribe: {str(e)}")
+        # Audio and settings are fixed for the job when it is submitted; later
+        # recordings or setting changes do not affect a queued transcription
+        long_recording = self.long_recording
+        audio_array = self.audio_array
+        audio_path = None
+        if long_recording is None and audio_array is None:
+            audio_path = self.temp_audio_file.name
+        trim_silence_enabled = self.trim_silence_var.get()
+        model_name = self.selected_model_name()
+        profile = self.profile_var.get()
+        
+        def process(job):
+            if long_recording is not None:
+                result = self.transcribe_long_recording(long_recording, trim_silence_enabled,
+                                                        model_name, profile, job)
+                return result["text"].strip()
+            
+            # Recordings are handed over in memory; loaded files come from the
+            # decoded-PCM cache (waiting for the background decode if still running)
+            audio = audio_array if audio_array is not None else self.decoded_audio_cache.load(audio_path)
+            
+            timeline = None
+            if trim_silence_enabled:
+                audio, timeline = trim_silence(audio)
+                if not len(audio):
+                    return ""
+                if timeline.removed_seconds > 0:
+                    message = (f"🎯 Transcribing audio... (trimmed {timeline.removed_seconds:.1f}s "
+                               f"of silence, {timeline.removed_fraction:.0%})")
+                    self.post_status(message)
+            if job.cancelled:
+                return None
+            
+            parallel = (self.parallel_workers > 1
+                        and len(audio) >= self.parallel_min_seconds * WHISPER_SAMPLE_RATE)
+            result = self.transcribe_audio(audio, model_name, profile, use_cache=True,
+                                           parallel=parallel)
+            if timeline is not None:
+                timeline.remap_segments(result["segments"])
+            return result["text"].strip()
+        
+        def on_error(error):
+            self.status_var.set("❌ Transcription failed")
+            self.transcribe_button.config(state="normal")
+            messagebox.showerror("Transcription Error", f"Failed to transcribe: {str(error)}")
+        
+        self.status_var.set("🎯 Transcribing audio...")
+        self.transcribe_button.config(state="disabled")
+        self.background.submit("transcribe", process,
+                               on_result=self.handle_transcription, on_error=on_error)
+    
+    def transcribe_audio(self, audio, model_name=None, profile=None, use_cache=False, parallel=False,
+                         **options):
+        """Run the ASR engine on audio; calls are serialized because models share the CPU
+        
+        Decoding options come from the named profile; explicit options override them.
+        With use_cache, results are looked up in and stored to the transcript cache;
+        with parallel, the audio is transcribed in chunks by worker processes.
+        """
+        model_name = model_name or self.model_key(self.default_model)
+        options = {**DECODING_PROFILES[profile or self.default_profile], **options}
+        run = self.run_parallel_transcription if parallel else self.run_transcription
+        if not use_cache:
+            return run(audio, model_name, options)
+        
+        # Only a pinned language is part of the key; the remembered session
+        # language merely skips detection and should not split cache entries
+        key_options = dict(options, language=options.get("language") or self.language_tracker.pinned)
+        if parallel:
+            key_options["chunk_seconds"] = self.parallel_chunk_seconds
+        key = self.transcript_cache.key(TranscriptCache.audio_digest(audio), model_name, key_options)
+        return self.transcript_cache.get_or_compute(key, lambda: run(audio, model_name, options))
+    
+    def run_transcription(self, audio, model_name, options):
+        backend = self.asr_backends[split_model_key(model_name)[0]]
+        if options.get("language") is None:
+            # Reuse the session language instead of running detection on every clip
+            options["language"] = self.language_tracker.language()
+        forced_language = options["language"]
+        
+        if model_name not in self.model_manager.loaded():
+            self.post_status(f"🔄 Loading Whisper '{model_name}' model...")
+        with self.model_manager.use(model_name) as model:
+            self.root.after(0, self.update_model_status)
+            with self.transcribe_lock:
+                result = backend.transcribe(model, audio, **options)
+        
+        self.language_tracker.observe(result, forced_language)
+        timings = result["timings"]
+        self.inference_stats.record(model_name, timings["transcribe"], timings["audio"])
+        self.root.after(0, lambda: self.update_latency_status(model_name))
+        return result
+    
+    def run_parallel_transcription(self, audio, model_name, options):
+        """Split long audio at pauses and transcribe the chunks in worker processes"""
+        chunks = plan_chunks(audio, WHISPER_SAMPLE_RATE, self.parallel_chunk_seconds)
+        workers = min(self.parallel_workers, len(chunks))
+        if workers <= 1:
+            return self.run_transcription(audio, model_name, options)
+        
+        if options.get("language") is None:
+            options["language"] = self.language_tracker.language()
+        if options["language"] is None:
+            # Detect once on the opening 30 s; workers detecting per chunk could
+            # decode parts of one file in different languages
+            self.post_status("🎯 Detecting language...")
+            probe = self.run_transcription(audio[:30 * WHISPER_SAMPLE_RATE], model_name,
+                                           dict(options, **DECODING_PROFILES["realtime"]))
+            options["language"] = probe.get("language")
+        engine, name = split_model_key(model_name)
+        
+        def on_progress(done, total):
+            self.post_status(f"🎯 Transcribing with {workers} processes... {done}/{total} chunks")
+        
+        started = time.perf_counter()
+        result = transcribe_in_parallel(self.asr_backends[engine], name, audio, chunks, options,
+                                        workers, self.parallel_threads_per_worker, on_progress)
+        print(f"Transcribed {len(audio) / WHISPER_SAMPLE_RATE / 60:.0f} min in {len(chunks)} chunks "
+              f"on {workers} processes in {time.perf_counter() - started:.0f}s")
+        self.language_tracker.observe(result, options["language"])
+        return result
+    
+    def transcribe_long_recording(self, buffer, trim_silence_enabled=True, model_name=None, profile=None,
+                                  job=None):
+        """Transcribe a disk-backed recording window by window straight from its mapping
+        
+        A cancelled job stops after the window in progress.
+        """
+        window = int(self.long_recording_window_seconds * buffer.rate)
+        segments = []
+        text = ""
+        start = 0
+        while start < len(buffer) and not (job is not None and job.cancelled):
+            samples = buffer.samples(start, start + window)
+            if start + len(samples) < len(buffer):
+                # Cut inside a pause so words are not split between windows
+                samples = samples[:find_quiet_cut(samples, buffer.rate)]
+            audio = pcm16_to_float32(samples, buffer.rate)
+            
+            timeline = None
+            if trim_silence_enabled:
+                audio, timeline = trim_silence(audio, buffer.rate)
+            if len(audio):
+                self.post_status(f"🎯 Transcribing {start / buffer.rate / 60:.0f}/"
+                                 f"{buffer.duration / 60:.0f} min...")
+                result = self.transcribe_audio(audio, model_name, profile, use_cache=True,
+                                               initial_prompt=text[-200:] or None)
+                if timeline is not None:
+                    timeline.remap_segments(result["segments"])
+                offset = start / buffer.rate
+                for segment in result["segments"]:
+                    segment["start"] += offset
+                    segment["end"] += offset
+                segments.extend(result["segments"])
+                text = f"{text} {result['text'].strip()}".strip()
+            start += len(samples)
+        
+        return {"text": text, "segments": segments}
+    
+    def handle_transcription(self, transcribed_text):
+        """Show a finished transcript, load it into the AI context and optionally analyze it"""
+        if transcribed_text:
+            self.current_transcription = transcribed_text
+            
+            self.transcription_text.delete(1.0, tk.END)
+            self.transcription_text.insert(1.0, transcribed_text)
+            
+            self.add_transcription_to_context()
+            
+            if self.auto_transcribe_var.get():
+                self.status_var.set("🤖 Requesting initial analysis...")
+                initial_prompt = "Please provide a brief summary of this transcript and identify the main topics or key points discussed."
+                self.add_to_chat(f"🎤 Auto-analysis request: {initial_prompt}", "user")
+                self.get_ai_response(initial_prompt)
+            else:
+                self.status_var.set("✅ Transcription completed - Ready for questions")
+        else:
+            self.status_var.set("⚠️ No speech detected in audio")
         
-        threading.Thread(target=process, daemon=True).start()
+        self.transcribe_button.config(state="normal")
     
     def send_manual_message(self):
         """Send a manually typed message to the AI"""
@@ -568,7 +3185,7 @@ class AIVoiceAssistant:
         
         self.chat_input.delete(1.0, tk.END)
         self.add_to_chat(f"💬 You: {message}", "user")
-        self.get_ai_response(message)
+        self.get_ai_response(message, supersede=self.supersede_responses)
     
     def use_transcription_in_chat(self):
         """Insert current transcription into chat input"""
@@ -585,7 +3202,8 @@ class AIVoiceAssistant:
     def add_transcription_to_context(self):
         """Add the current transcription to the AI context with specialized system prompt"""
         if self.current_transcription:
-            self.conversation_history = []
+            # The history belongs to the chat lane; the next chat job starts it afresh
+            self.context_generation += 1
             self.transcription_in_context = True
             self.add_to_chat("📋 Transcript loaded - AI is now ready to discuss this content", "system")
             self.status_var.set("📋 AI ready for transcript discussion")
@@ -611,43 +3229,55 @@ class AIVoiceAssistant:
     
     def test_lm_studio_connection(self):
         """Test connection to LM Studio"""
-        def test_connection():
-            try:
-                self.lm_studio_url = self.url_entry.get()
-                self.connection_status.config(text="🔄 Testing...", fg=self.colors['warning'])
-                
-                models_url = self.lm_studio_url.replace("/chat/completions", "/models")
-                response = requests.get(models_url, timeout=5)
-                
-                if response.status_code == 200:
-                    self.connection_status.config(text="● Connected", fg=self.colors['success'])
-                    self.status_var.set("🟢 LM Studio connected successfully")
-                else:
-                    self.connection_status.config(text="● Connection failed", fg=self.colors['error'])
-                    self.status_var.set(f"❌ Connection failed: {response.status_code}")
-                    
-            except requests.exceptions.RequestException as e:
+        self.lm_studio_url = self.url_entry.get()
+        self.connection_status.config(text="🔄 Testing...", fg=self.colors['warning'])
+        
+        def test_connection(job, url):
+            return self.lm_client.models(url).status_code
+        
+        def on_result(status_code):
+            if status_code == 200:
+                self.connection_status.config(text="● Connected", fg=self.colors['success'])
+                self.status_var.set("🟢 LM Studio connected successfully")
+            else:
                 self.connection_status.config(text="● Connection failed", fg=self.colors['error'])
-                self.status_var.set(f"❌ Connection error: {str(e)}")
+                self.status_var.set(f"❌ Connection failed: {status_code}")
         
-        threading.Thread(target=test_connection, daemon=True).start()
+        def on_error(error):
+            self.connection_status.config(text="● Connection failed", fg=self.colors['error'])
+            self.status_var.set(f"❌ Connection error: {str(error)}")
+        
+        self.background.submit("connection", test_connection, self.lm_studio_url,
+                               on_result=on_result, on_error=on_error)
     
-    def get_ai_response(self, message):
-        """Get response from LM Studio with transcript always in context"""
-        def get_response():
-            try:
-                headers = {
-                    "Content-Type": "application/json",
-                    "Authorization": f"Bearer {self.api_key}"
-                }
-                
-                messages_to_send = []
-                
-                if self.current_transcription:
-                    system_prompt = f"""You are an AI assistant specialized in analyzing and discussing transcribed content. Your role is to help users understand, analyze, and explore the following transcript.
+    def get_ai_response(self, message, supersede=False):
+        """Get response from LM Studio with transcript always in context
+        
+        Requests run one at a time, in order, on the "chat" lane; the history is
+        only touched by chat jobs, so each request sees all earlier replies.
+        With supersede, the request first aborts the ones in progress; hands-free
+        utterances and auto-analysis queue behind them instead.
+        """
+        if supersede and self.background.cancel_lane("chat"):
+            self.status_var.set("⏹️ Previous response superseded")
+        
+        def get_response(job):
+            generation = self.context_generation
+            if generation != self.history_generation:
+                # A new transcript was loaded or the chat cleared since the last request
+                self.conversation_history = []
+                self.context_builder.reset()
+                self.history_generation = generation
+            
+            system_prompt = None
+            if self.current_transcription:
+                # Long transcripts get at most half of the prompt budget
+                transcript = self.context_builder.fit_text(self.current_transcription,
+                                                           self.context_builder.prompt_budget // 2)
+                system_prompt = f"""You are an AI assistant specialized in analyzing and discussing transcribed content. Your role is to help users understand, analyze, and explore the following transcript.
 
 TRANSCRIPT TO ANALYZE:
-\"\"\"{self.current_transcription}\"\"\"
+\"\"\"{transcript}\"\"\"
 
 INSTRUCTIONS:
 - Focus ALL responses on the content of this transcript
@@ -659,59 +3289,128 @@ INSTRUCTIONS:
 - Maintain context of our entire conversation about this transcript
 
 You should now be ready to answer any questions about this transcript content."""
-                    
-                    messages_to_send.append({
-                        "role": "system", 
-                        "content": system_prompt
-                    })
-                
-                for msg in self.conversation_history:
-                    if msg["role"] != "system":
-                        messages_to_send.append(msg)
-                
-                messages_to_send.append({"role": "user", "content": message})
-                
-                if len(messages_to_send) > 31:
-                    messages_to_send = [messages_to_send[0]] + messages_to_send[-30:]
-                
-                data = {
-                    "model": "local-model",
-                    "messages": messages_to_send,
-                    "temperature": 0.7,
-                    "max_tokens": 1500
-                }
-                
-                response = requests.post(
-                    self.lm_studio_url,
-                    headers=headers,
-                    json=data,
-                    timeout=30
-                )
-                
-                if response.status_code == 200:
-                    result = response.json()
-                    ai_message = result['choices'][0]['message']['content']
-                    
-                    self.conversation_history.append({"role": "user", "content": message})
-                    self.conversation_history.append({"role": "assistant", "content": ai_message})
-                    
-                    self.add_to_chat(f"🤖 AI: {ai_message}", "assistant")
-                    self.status_var.set("✅ Response received")
+            
+            # Older turns are folded into a rolling summary once the budget is reached
+            messages_to_send = self.context_builder.build(system_prompt, self.conversation_history,
+                                                          message, job)
+            if job.cancelled:
+                return None
+            
+            data = {
+                "model": "local-model",
+                "messages": messages_to_send,
+                "temperature": 0.7,
+                "max_tokens": self.context_builder.reply_tokens,
+                "stream": self.stream_responses
+            }
+            
+            # The read timeout applies between received chunks, so with streaming
+            # it limits the gap between tokens rather than the whole answer
+            started = time.perf_counter()
+            response = self.lm_client.chat(self.lm_studio_url, data)
+            
+            job.on_cancel(response.close)
+            with response:
+                if response.status_code != 200:
+                    raise RuntimeError(f"API Error {response.status_code}: {response.text}")
+                if "text/event-stream" in response.headers.get("Content-Type", ""):
+                    ai_message, first_token = self.render_streamed_reply(response, started, job)
                 else:
-                    error_msg = f"API Error {response.status_code}: {response.text}"
-                    self.add_to_chat(f"❌ Error: {error_msg}", "error")
-                    self.status_var.set("❌ API error")
-                    
-            except requests.exceptions.RequestException as e:
-                error_msg = f"Connection error: {str(e)}"
-                self.add_to_chat(f"❌ Error: {error_msg}", "error")
+                    ai_message = response.json()['choices'][0]['message']['content']
+                    first_token = time.perf_counter() - started
+                    self.add_to_chat(f"🤖 AI: {ai_message}", "assistant")
+            
+            if not job.cancelled:
+                self.conversation_history.append({"role": "user", "content": message})
+                self.conversation_history.append({"role": "assistant", "content": ai_message})
+            return first_token
+        
+        def on_result(first_token):
+            self.status_var.set(f"✅ Response received (first token after {first_token:.1f}s)")
+        
+        def on_error(error):
+            if isinstance(error, requests.exceptions.RequestException):
+                self.add_to_chat(f"❌ Error: Connection error: {str(error)}", "error")
                 self.status_var.set("❌ Connection error")
-            except Exception as e:
-                error_msg = f"Unexpected error: {str(e)}"
-                self.add_to_chat(f"❌ Error: {error_msg}", "error")
-                self.status_var.set("❌ Unexpected error")
+            else:
+                self.add_to_chat(f"❌ Error: {str(error)}", "error")
+                self.status_var.set("❌ API error")
+        
+        return self.background.submit("chat", get_response, on_result=on_result, on_error=on_error)
+    
+    def summarize_turns(self, job, turns, previous_summary, max_tokens):
+        """Condense older chat turns (and the previous summary) with the LLM
+        
+        Runs inside the chat job that needs it; cancelling the job closes the request.
+        """
+        conversation = "\n\n".join(f"{msg['role'].upper()}: {msg['content']}" for msg in turns)
+        prompt = ("Summarize this conversation about a transcript in a few short bullet points, "
+                  "keeping facts, answers and open questions.\n\n")
+        if previous_summary:
+            prompt += f"EARLIER SUMMARY:\n{previous_summary}\n\n"
+        prompt += f"CONVERSATION:\n{conversation}"
+        data = {
+            "model": "local-model",
+            "messages": [{"role": "user", "content": prompt}],
+            "temperature": 0.2,
+            "max_tokens": max_tokens,
+            "stream": False
+        }
+        response = self.lm_client.chat(self.lm_studio_url, data)
+        if job is not None:
+            job.on_cancel(response.close)
+        with response:
+            if response.status_code != 200:
+                raise RuntimeError(f"API Error {response.status_code}")
+            return response.json()['choices'][0]['message']['content'].strip()
+    
+    def stop_ai_response(self):
+        """Abort the AI reply being generated and any questions still queued
+        
+        Closing the stream makes LM Studio stop generating and frees its slot.
+        """
+        if self.background.cancel_lane("chat"):
+            self.add_to_chat("⏹️ Response stopped", "system")
+            self.status_var.set("⏹️ AI response stopped")
+    
+    def render_streamed_reply(self, response, started, job):
+        """Append an SSE reply to the chat as it arrives; returns (text, first-token seconds)"""
+        mark = f"stream{id(response)}"
+        
+        def begin():
+            self.chat_display.config(state=tk.NORMAL)
+            timestamp = datetime.now().strftime("%H:%M:%S")
+            self.chat_display.insert(tk.END, f"[{timestamp}] ", "timestamp")
+            self.chat_display.insert(tk.END, "🤖 AI: ", "assistant")
+            self.chat_display.insert(tk.END, "\n\n", "assistant")
+            # Tokens are inserted at the mark, which keeps moving right past them
+            self.chat_display.mark_set(mark, "end-3c")
+            self.chat_display.config(state=tk.DISABLED)
+            self.chat_display.see(tk.END)
         
-        threading.Thread(target=get_response, daemon=True).start()
+        def append(text):
+            self.chat_display.config(state=tk.NORMAL)
+            self.chat_display.insert(mark, text, "assistant")
+            self.chat_display.config(state=tk.DISABLED)
+            self.chat_display.see(tk.END)
+        
+        self.root.after(0, begin)
+        batcher = TokenBatcher(append, self.root.after)
+        parts = []
+        first_token = None
+        try:
+            for delta in iter_sse_deltas(response.iter_lines(chunk_size=None)):
+                if job.cancelled:
+                    break
+                if first_token is None:
+                    first_token = time.perf_counter() - started
+                    self.post_status("🤖 AI is responding...")
+                parts.append(delta)
+                batcher.add(delta)
+        finally:
+            # Runs after the last batch has been flushed
+            self.root.after(batcher.interval_ms + 10, lambda: self.chat_display.mark_unset(mark))
+        return "".join(parts), first_token if first_token is not None else time.perf_counter() - started
     
     def add_to_chat(self, message, sender_type):
         """Add message to chat display with styling"""
@@ -733,23 +3432,18 @@ You should now be ready to answer any questions about this transcript content.""
         self.chat_display.config(state=tk.NORMAL)
         self.chat_display.delete(1.0, tk.END)
         self.chat_display.config(state=tk.DISABLED)
-        self.conversation_history = []
+        self.background.cancel_lane("chat")
+        self.context_generation += 1
         self.transcription_in_context = False
         self.status_var.set("🗑️ Chat cleared")
     
     def __del__(self):
         """Cleanup when the application is closed"""
-        if hasattr(self, 'p'):
+        if getattr(self, 'p', None) is not None:
             self.p.terminate()
-        
-        if hasattr(self, 'temp_audio_file') and hasattr(self.temp_audio_file, 'name'):
-            try:
-                if os.path.exists(self.temp_audio_file.name):
-                    os.unlink(self.temp_audio_file.name)
-            except:
-                pass
 
 def main():
+    startup = StartupTimer()
     root = tk.Tk()
     
     try:
@@ -757,16 +3451,20 @@ def main():
     except:
         pass
     
-    app = AIVoiceAssistant(root)
+    app = AIVoiceAssistant(root, startup)
     
     def on_closing():
         """Handle application closing"""
         if app.is_recording:
             app.stop_recording()
+        app.background.close()
+        app.lm_client.close()
         root.destroy()
     
     root.protocol("WM_DELETE_WINDOW", on_closing)
     root.mainloop()
 
 if __name__ == "__main__":
+    # Parallel transcription spawns worker processes; frozen builds need this
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
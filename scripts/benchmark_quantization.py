@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Quantization benchmark for AI Voice Assistant
+Compares fp32 and dynamic int8 Whisper inference on a test clip
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# Add parent directory to path to import main module
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+
+
+def word_error_rate(reference, hypothesis):
+    """Word-level edit distance between two transcripts, relative to the reference"""
+    ref = reference.lower().split()
+    hyp = hypothesis.lower().split()
+    if not ref:
+        return 0.0 if not hyp else 1.0
+
+    previous = list(range(len(hyp) + 1))
+    for i, ref_word in enumerate(ref, 1):
+        current = [i]
+        for j, hyp_word in enumerate(hyp, 1):
+            current.append(min(previous[j] + 1,
+                               current[j - 1] + 1,
+                               previous[j - 1] + (ref_word != hyp_word)))
+        previous = current
+    return previous[-1] / len(ref)
+
+
+def run_variant(store, model_name, audio, quantize, runs, profile="balanced"):
+    """Load one variant, then time its transcriptions of the clip"""
+    started = time.perf_counter()
+    model = store.load(model_name)
+    if quantize:
+        model = main.quantize_whisper_model(model)
+    load_seconds = time.perf_counter() - started
+
+    main.warm_up_model(model)
+
+    timings = []
+    text = ""
+    for _ in range(runs):
+        started = time.perf_counter()
+        options = dict(main.DECODING_PROFILES[profile], fp16=False)
+        text = model.transcribe(audio, **options)["text"].strip()
+        timings.append(time.perf_counter() - started)
+
+    return {
+        "load": load_seconds,
+        "transcribe": min(timings),
+        "size": main.model_size_bytes(model),
+        "text": text,
+    }
+
+
+def main_benchmark():
+    """Main benchmark process"""
+    parser = argparse.ArgumentParser(description="Compare fp32 and int8 Whisper inference")
+    parser.add_argument("audio", help="Speech clip to transcribe (any format ffmpeg reads)")
+    parser.add_argument("--model", default="small", choices=main.WHISPER_MODEL_SIZES)
+    parser.add_argument("--profile", default="balanced", choices=list(main.DECODING_PROFILES),
+                        help="Decoding profile used for both variants")
+    parser.add_argument("--runs", type=int, default=3, help="Timed runs per variant")
+    parser.add_argument("--store",
+                        default=os.path.join(os.path.expanduser("~"), ".cache",
+                                             "ai-voice-assistant", "models"),
+                        help="Local model store directory")
+    args = parser.parse_args()
+
+    print("AI Voice Assistant - Quantization Benchmark")
+    print(f"Model: {args.model}  Profile: {args.profile}  Clip: {args.audio}")
+
+    whisper = main.import_whisper()
+    audio = whisper.load_audio(args.audio)
+    clip_seconds = len(audio) / main.WHISPER_SAMPLE_RATE
+    store = main.LocalModelStore(args.store)
+
+    fp32 = run_variant(store, args.model, audio, False, args.runs, args.profile)
+    int8 = run_variant(store, args.model, audio, True, args.runs, args.profile)
+
+    print(f"\n{'':8}{'load':>10}{'transcribe':>12}{'RTF':>8}{'weights':>12}")
+    for label, result in (("fp32", fp32), ("int8", int8)):
+        print(f"{label:8}{result['load']:>9.2f}s{result['transcribe']:>11.2f}s"
+              f"{result['transcribe'] / clip_seconds:>8.2f}"
+              f"{result['size'] / 1024 / 1024:>10.0f}MB")
+
+    print(f"\nSpeed-up: {fp32['transcribe'] / int8['transcribe']:.2f}x")
+    print(f"WER of int8 vs fp32 transcript: {word_error_rate(fp32['text'], int8['text']):.1%}")
+    print(f"\nfp32: {fp32['text']}")
+    print(f"int8: {int8['text']}")
+
+
+if __name__ == "__main__":
+    main_benchmark()
@@ -34,6 +34,7 @@ class TestBasicFunctionality(unittest.TestCase):
             'tempfile',
             'os',
             'requests',
+            'numpy',
             'whisper'
         ]
         
@@ -63,6 +64,27 @@ class TestBasicFunctionality(unittest.TestCase):
             self.assertTrue(callable(getattr(main, 'main')),
                            "main function is not callable")
 
+    @unittest.skipUnless(MAIN_IMPORT_SUCCESS, "main module not importable")
+    def test_import_does_not_load_heavy_modules(self):
+        """Test that importing main leaves whisper, torch and pyaudio for later"""
+        import subprocess
+        code = ("import sys, main; "
+                "print(sorted(m for m in ('whisper', 'torch', 'pyaudio') if m in sys.modules))")
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        self.assertEqual(output.returncode, 0, output.stderr)
+        self.assertEqual(output.stdout.strip().splitlines()[-1], "[]")
+
+    def test_startup_timer_report(self):
+        """Test that startup phases are collected into a readable report"""
+        if MAIN_IMPORT_SUCCESS:
+            timer = main.StartupTimer()
+            timer.record("ui")
+            timer.record("model load", timer.origin)
+            report = timer.report()
+            self.assertIn("ui ", report)
+            self.assertIn("model load ", report)
+
     def test_default_settings(self):
         """Test default configuration values"""
         if MAIN_IMPORT_SUCCESS:
@@ -84,6 +106,762 @@ class TestAudioHandling(unittest.TestCase):
         self.assertTrue(len(self.test_audio_formats) > 0,
                        "Audio formats list should not be empty")
 
+    @unittest.skipUnless(MAIN_IMPORT_SUCCESS, "main module not importable")
+    def test_pcm_conversion_for_whisper(self):
+        """Test that recorded PCM is converted to 16 kHz float32"""
+        import numpy as np
+        pcm = (np.ones(44100, dtype=np.int16) * 16384).tobytes()
+        audio = main.pcm16_to_float32(pcm, 44100)
+        self.assertEqual(audio.dtype, np.float32)
+        self.assertEqual(len(audio), main.WHISPER_SAMPLE_RATE)
+        # Skip the resampling filter's start-up transient
+        self.assertAlmostEqual(float(audio[100:].mean()), 0.5, places=3)
+
+    @unittest.skipUnless(MAIN_IMPORT_SUCCESS, "main module not importable")
+    def test_pcm_conversion_downmixes_stereo(self):
+        """Test that interleaved stereo PCM is averaged to mono"""
+        import numpy as np
+        pcm = np.array([1000, 3000] * 160, dtype=np.int16).tobytes()
+        audio = main.pcm16_to_float32(pcm, 16000, channels=2)
+        self.assertEqual(len(audio), 160)
+        self.assertAlmostEqual(float(audio[0]), 2000 / 32768.0, places=5)
+
+    @unittest.skipUnless(MAIN_IMPORT_SUCCESS, "main module not importable")
+    def test_capture_buffer_grows_without_losing_samples(self):
+        """Test that the capture buffer keeps samples contiguous across growth"""
+        import numpy as np
+        buffer = main.CaptureBuffer(rate=100, initial_seconds=1)
+        for i in range(5):
+            buffer.append(np.full(64, i, dtype=np.int16).tobytes())
+        self.assertEqual(len(buffer), 320)
+        self.assertEqual(buffer.samples()[64 * 3], 3)
+        self.assertEqual(bytes(buffer.view()), buffer.samples().tobytes())
+        self.assertAlmostEqual(buffer.duration, 3.2)
+
+    @unittest.skipUnless(MAIN_IMPORT_SUCCESS, "main module not importable")
+    def test_capture_engine_queues_blocks_and_counts_overflows(self):
+        """Test the capture callback without opening a real stream"""
+        engine = main.CaptureEngine(None, format=8, channels=1, rate=16000, chunk=4)
+        engine._callback(b"\x00" * 8, 4, {}, 0)
+        result = engine._callback(b"\x01" * 8, 4, {}, main.PA_INPUT_OVERFLOW)
+        self.assertEqual(result, (None, main.PA_CONTINUE))
+        self.assertEqual(engine.overflows, 1)
+        self.assertEqual(engine.drain(), [b"\x00" * 8, b"\x01" * 8])
+        self.assertEqual(engine.drain(), [])
+
+    @unittest.skipUnless(MAIN_IMPORT_SUCCESS, "main module not importable")
+    def test_streaming_resampler_matches_one_shot(self):
+        """Test that block-wise resampling equals resampling in one pass"""
+        import numpy as np
+        t = np.arange(44100) / 44100
+        tone = np.sin(2 * np.pi * 1000 * t) * 10000
+        streaming = main.StreamingResampler(44100)
+        blocks = [streaming.process(tone[i:i + 1000]) for i in range(0, len(tone), 1000)]
+        one_shot = main.StreamingResampler(44100).process(tone)
+        self.assertEqual(len(one_shot), 16000)
+        np.testing.assert_allclose(np.concatenate(blocks), one_shot, atol=1e-3)
+        self.assertAlmostEqual(float(one_shot[200:].std()), 7071, delta=20)
+
+    @unittest.skipUnless(MAIN_IMPORT_SUCCESS, "main module not importable")
+    def test_streaming_resampler_rejects_aliases(self):
+        """Test that content above the 8 kHz output Nyquist is filtered out"""
+        import numpy as np
+        t = np.arange(44100) / 44100
+        tone = np.sin(2 * np.pi * 10000 * t) * 10000
+        out = main.StreamingResampler(44100).process(tone)
+        self.assertLess(float(out[200:].std()), 10)
+
+    @unittest.skipUnless(MAIN_IMPORT_SUCCESS, "main module not importable")
+    def test_spilling_buffer_is_a_valid_wav_while_recording(self):
+        """Test that disk-backed capture reads back across segments and stays playable"""
+        import numpy as np
+        import tempfile
+        import wave
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "session.wav")
+            buffer = main.SpillingCaptureBuffer(path, 16000, segment_seconds=1)
+            samples = (np.arange(16000 * 3 + 500) % 1000).astype(np.int16)
+            for i in range(0, len(samples), 1024):
+                buffer.append(samples[i:i + 1024].tobytes())
+            np.testing.assert_array_equal(buffer.samples(15000, 33000), samples[15000:33000])
+            np.testing.assert_array_equal(buffer.samples(48000), samples[48000:])
+
+            buffer.flush()
+            with wave.open(path) as wf:
+                self.assertEqual(wf.getnframes(), len(samples))
+
+            buffer.close()
+            self.assertEqual(os.path.getsize(path), main.WAV_HEADER_SIZE + 2 * len(samples))
+            np.testing.assert_array_equal(buffer.samples(), samples)
+            # Release the mapping so the directory can be removed on Windows
+            buffer._reader = None
+
+    @unittest.skipUnless(MAIN_IMPORT_SUCCESS, "main module not importable")
+    def test_input_levels(self):
+        """Test RMS/peak levels and clipping detection for the level meter"""
+        import numpy as np
+        samples = np.array([16384, -16384] * 100 + [32767, -32768], dtype=np.int16)
+        rms_db, peak_db, clipped = main.compute_input_levels(samples)
+        self.assertAlmostEqual(rms_db, -6.0, delta=0.2)
+        self.assertAlmostEqual(peak_db, 0.0, delta=0.01)
+        self.assertEqual(clipped, 2)
+        self.assertEqual(main.compute_input_levels(samples[:0]), (-96.0, -96.0, 0))
+
+
+@unittest.skipUnless(MAIN_IMPORT_SUCCESS, "main module not importable")
+class TestVoiceActivityDetection(unittest.TestCase):
+    """Test silence trimming before transcription"""
+
+    def setUp(self):
+        import numpy as np
+        self.rate = main.WHISPER_SAMPLE_RATE
+        rng = np.random.default_rng(0)
+        self.audio = rng.normal(0, 0.001, self.rate * 10).astype(np.float32)
+        tone = np.sin(2 * np.pi * 200 * np.arange(2 * self.rate) / self.rate) * 0.3
+        self.audio[2 * self.rate:4 * self.rate] += tone.astype(np.float32)
+
+    def test_speech_region_detected(self):
+        """Test that the tone burst is found with padding around it"""
+        regions = main.detect_speech_regions(self.audio, self.rate)
+        self.assertEqual(len(regions), 1)
+        start, end = regions[0]
+        self.assertTrue(1.7 * self.rate <= start <= 2 * self.rate)
+        self.assertTrue(4 * self.rate <= end <= 4.3 * self.rate)
+
+    def test_trimmed_timestamps_map_back(self):
+        """Test that trimmed-audio times map back to the original recording"""
+        trimmed, timeline = main.trim_silence(self.audio, self.rate)
+        self.assertLess(len(trimmed), len(self.audio) / 2)
+        self.assertGreater(timeline.removed_seconds, 7)
+        start = timeline.regions[0][0] / self.rate
+        self.assertAlmostEqual(timeline.to_original(0.5), start + 0.5)
+        segments = timeline.remap_segments([{"start": 0.0, "end": 1.0}])
+        self.assertAlmostEqual(segments[0]["start"], start)
+
+    def test_silence_only_returns_nothing(self):
+        """Test that pure background noise yields no speech"""
+        self.assertEqual(main.detect_speech_regions(self.audio[:self.rate], self.rate), [])
+
+    def test_live_segmenter_cuts_at_pauses(self):
+        """Test that streamed blocks are split into one utterance per burst"""
+        import numpy as np
+        rng = np.random.default_rng(1)
+        stream = rng.normal(0, 30, self.rate * 10).astype(np.int16)
+        tone = (np.sin(2 * np.pi * 200 * np.arange(self.rate) / self.rate) * 8000).astype(np.int16)
+        stream[self.rate:2 * self.rate] += tone
+        stream[5 * self.rate:6 * self.rate] += tone
+        segmenter = main.UtteranceSegmenter(self.rate)
+        utterances = []
+        for i in range(0, len(stream), 1024):
+            utterances += segmenter.process(stream[i:i + 1024])
+        utterances += segmenter.flush()
+        self.assertEqual(len(utterances), 2)
+        self.assertAlmostEqual(utterances[0][1] / self.rate, 2.0, delta=0.05)
+        self.assertAlmostEqual(utterances[1][0] / self.rate, 4.7, delta=0.05)
+
+    def test_discarding_consumed_audio_keeps_buffer_bounded(self):
+        """Test that a long hands-free session reuses the same storage"""
+        import numpy as np
+        rng = np.random.default_rng(2)
+        tone = (np.sin(2 * np.pi * 200 * np.arange(self.rate) / self.rate) * 8000).astype(np.int16)
+        buffer = main.CaptureBuffer(self.rate, initial_seconds=5)
+        segmenter = main.UtteranceSegmenter(self.rate)
+        capacity = len(buffer._data)
+        utterances = []
+        for second in range(60):
+            block = rng.normal(0, 30, self.rate).astype(np.int16)
+            if second % 4 == 1:
+                block += tone
+            buffer.append(block.tobytes())
+            for start, end in segmenter.process(buffer.samples(segmenter.position)):
+                utterances.append(buffer.samples(start, end).copy())
+            buffer.discard(segmenter.retain_from)
+        self.assertEqual(len(buffer), 60 * self.rate)
+        self.assertEqual(len(buffer._data), capacity)
+        self.assertEqual(len(utterances), 15)
+        self.assertGreater(np.abs(utterances[-1]).max(), 4000)
+        with self.assertRaises(ValueError):
+            buffer.samples(0, self.rate)
+
+
+@unittest.skipUnless(MAIN_IMPORT_SUCCESS, "main module not importable")
+class TestStreamingTranscription(unittest.TestCase):
+    """Test live windowed transcription with a fake model"""
+
+    def fake_transcribe(self, audio, **options):
+        """Return one segment per three seconds of audio"""
+        self.calls.append(len(audio))
+        seconds = len(audio) / main.WHISPER_SAMPLE_RATE
+        starts = range(0, int(seconds), 3)
+        return {"segments": [{"start": float(s), "end": float(min(s + 3, seconds)),
+                              "text": f" part{s}"} for s in starts]}
+
+    def test_windows_are_finalized_and_tail_flushed(self):
+        """Test that windows commit segments and finish() decodes only the tail"""
+        import numpy as np
+        self.calls = []
+        updates = []
+        buffer = main.CaptureBuffer(main.WHISPER_SAMPLE_RATE, initial_seconds=30)
+        buffer.append(np.zeros(main.WHISPER_SAMPLE_RATE * 25, dtype=np.int16).tobytes())
+        streamer = main.StreamingTranscriber(self.fake_transcribe, buffer,
+                                             lambda final, partial: updates.append((final, partial)))
+        streamer._transcribe_window()
+        # 10 s window with 2 s overlap: segments ending by 8 s are final
+        self.assertEqual(streamer.committed, 6 * main.WHISPER_SAMPLE_RATE)
+        self.assertEqual(updates[-1], ("part0 part3", "part6 part9"))
+
+        finished = []
+        done = main.threading.Event()
+        streamer.start()
+        streamer.finish(lambda text: (finished.append(text), done.set()))
+        self.assertTrue(done.wait(5))
+        self.assertEqual(streamer.committed, len(buffer))
+        self.assertEqual(self.calls[-1], 19 * main.WHISPER_SAMPLE_RATE)
+        self.assertTrue(finished[0].startswith("part0 part3 part0"))
+
+    def test_failing_window_stops_live_transcription(self):
+        """Test that a persistent error is not retried on every notify()"""
+        import time
+        import numpy as np
+        self.calls = []
+
+        def failing_transcribe(audio, **options):
+            self.calls.append(len(audio))
+            raise RuntimeError("model unavailable")
+
+        buffer = main.CaptureBuffer(main.WHISPER_SAMPLE_RATE, initial_seconds=30)
+        buffer.append(np.zeros(main.WHISPER_SAMPLE_RATE * 25, dtype=np.int16).tobytes())
+        streamer = main.StreamingTranscriber(failing_transcribe, buffer, lambda final, partial: None)
+        streamer.start()
+        for _ in range(5):
+            streamer.notify()
+            time.sleep(0.02)
+        streamer.close()
+        streamer._thread.join(2)
+        self.assertFalse(streamer._thread.is_alive())
+        self.assertEqual(len(self.calls), 1)
+        self.assertIsInstance(streamer.error, RuntimeError)
+
+
+class FakeTensor:
+    """Stand-in for a torch tensor in model-size accounting"""
+
+    def __init__(self, size_bytes):
+        self.size_bytes = size_bytes
+
+    def numel(self):
+        return self.size_bytes
+
+    def element_size(self):
+        return 1
+
+
+class FakeModel:
+    """Stand-in for a Whisper model of a given size in MB"""
+
+    def __init__(self, name, size_mb):
+        self.name = name
+        self.size_mb = size_mb
+
+    def parameters(self):
+        return [FakeTensor(self.size_mb * 1024 * 1024)]
+
+    def buffers(self):
+        return []
+
+
+@unittest.skipUnless(MAIN_IMPORT_SUCCESS, "main module not importable")
+class TestWhisperModelManager(unittest.TestCase):
+    """Test the LRU model cache"""
+
+    def setUp(self):
+        self.sizes = {"tiny": 100, "base": 200, "small": 600}
+        self.loads = []
+        self.manager = main.WhisperModelManager(self.load, ram_budget_mb=800, idle_minutes=1)
+
+    def load(self, name):
+        self.loads.append(name)
+        return FakeModel(name, self.sizes[name])
+
+    def test_models_are_cached(self):
+        """Test that a model is loaded once and reused"""
+        first = self.manager.get("base")
+        self.assertIs(self.manager.get("base"), first)
+        self.assertEqual(self.loads, ["base"])
+
+    def test_least_recently_used_model_is_evicted(self):
+        """Test that loading past the RAM budget drops the LRU model"""
+        self.manager.get("tiny")
+        self.manager.get("base")
+        self.manager.get("tiny")
+        self.manager.get("small")
+        self.assertEqual(self.manager.loaded(), ["tiny", "small"])
+        self.assertLessEqual(self.manager.memory_bytes(), 800 * 1024 * 1024)
+
+    def test_idle_models_unload_unless_in_use(self):
+        """Test idle unloading skips models that are borrowed"""
+        import time
+        self.manager.get("tiny")
+        with self.manager.use("base"):
+            unloaded = self.manager.unload_idle(now=time.monotonic() + 120)
+        self.assertEqual(unloaded, ["tiny"])
+        self.assertEqual(self.manager.loaded(), ["base"])
+
+
+@unittest.skipUnless(MAIN_IMPORT_SUCCESS, "main module not importable")
+class TestInferenceStats(unittest.TestCase):
+    """Test per-model latency accounting"""
+
+    def test_inference_stats_separate_first_call(self):
+        """Test that the first call is reported apart from steady-state calls"""
+        stats = main.InferenceStats()
+        stats.record("base", 3.0, 1.0)
+        stats.record("base", 1.0, 10.0)
+        stats.record("base", 2.0, 10.0)
+        summary = stats.summary("base")
+        self.assertIn("first call 3.00s", summary)
+        self.assertIn("steady 1.50s/call", summary)
+        self.assertIn("0.15x real-time", summary)
+        self.assertEqual(stats.summary("small"), "")
+
+    def test_warm_up_is_not_the_first_call(self):
+        """Test that the warm-up run is reported apart from real transcriptions"""
+        stats = main.InferenceStats()
+        stats.record_warm_up("base", 4.0)
+        self.assertEqual(stats.summary("base"), "⏱️ base: warm-up 4.00s")
+        stats.record("base", 1.0, 10.0)
+        self.assertIn("warm-up 4.00s • first call 1.00s", stats.summary("base"))
+
+
+if MAIN_IMPORT_SUCCESS:
+    class FakeBackend(main.ASRBackend):
+        """Engine that 'recognizes' one segment per second of audio"""
+
+        name = "fake"
+
+        def __init__(self):
+            super().__init__()
+            self.prepared = []
+
+        def load_model(self, model_name):
+            return FakeModel(model_name, 1)
+
+        def prepare(self, model_name):
+            self.prepared.append(model_name)
+
+        def run(self, model, audio, **options):
+            segments = [{"start": float(i), "end": float(i + 1), "text": f" word{i}"}
+                        for i in range(int(len(audio) / main.WHISPER_SAMPLE_RATE))]
+            return {"text": "".join(s["text"] for s in segments),
+                    "segments": segments, "language": "en"}
+
+
+@unittest.skipUnless(MAIN_IMPORT_SUCCESS, "main module not importable")
+class TestBackgroundLoop(unittest.TestCase):
+    """Test the lane scheduler used for transcription and LM Studio jobs"""
+
+    def setUp(self):
+        import queue
+        self.dispatched = queue.Queue()
+        self.background = main.BackgroundLoop(self.dispatched.put, max_concurrency=2)
+
+    def tearDown(self):
+        self.background.close()
+
+    def test_lane_runs_jobs_in_order_and_dispatches_results(self):
+        """Test that a lane is sequential and results go through dispatch"""
+        import threading
+        import time
+        running = []
+        overlap = []
+        lock = threading.Lock()
+
+        def work(job, number):
+            with lock:
+                running.append(number)
+                overlap.append(len(running))
+            time.sleep(0.02)
+            with lock:
+                running.remove(number)
+            return number
+
+        results = []
+        for number in range(5):
+            self.background.submit("chat", work, number, on_result=results.append)
+        for _ in range(5):
+            self.dispatched.get(timeout=5)()
+        self.assertEqual(results, [0, 1, 2, 3, 4])
+        self.assertEqual(max(overlap), 1)
+
+    def test_errors_are_dispatched_to_on_error(self):
+        """Test that a failing job reports its exception through dispatch"""
+        def fail(job):
+            raise ValueError("boom")
+
+        errors = []
+        self.background.submit("connection", fail, on_error=errors.append)
+        self.dispatched.get(timeout=5)()
+        self.assertEqual(str(errors[0]), "boom")
+
+    def test_cancel_skips_queued_jobs_and_notifies_running_one(self):
+        """Test that cancelling a lane stops the running job and drops queued ones"""
+        import threading
+        started = threading.Event()
+        stopped = threading.Event()
+        ran = []
+
+        def slow(job):
+            job.on_cancel(stopped.set)
+            started.set()
+            stopped.wait(5)
+            return "stale"
+
+        self.background.submit("chat", slow, on_result=ran.append)
+        self.background.submit("chat", lambda job: ran.append("queued"))
+        started.wait(5)
+        self.assertEqual(len(self.background.cancel_lane("chat")), 2)
+        self.assertTrue(stopped.is_set())
+
+        done = threading.Event()
+        self.background.submit("chat", lambda job: done.set())
+        self.assertTrue(done.wait(5))
+        self.assertEqual(ran, [])
+        self.assertTrue(self.dispatched.empty())
+
+
+@unittest.skipUnless(MAIN_IMPORT_SUCCESS, "main module not importable")
+class TestASRBackends(unittest.TestCase):
+    """Test the speech-recognition engine interface"""
+
+    def test_fake_backend_through_model_manager(self):
+        """Test that any backend plugs into the model manager and reports timings"""
+        import numpy as np
+        backend = FakeBackend()
+        manager = main.WhisperModelManager(backend.load, ram_budget_mb=10,
+                                           size_of=backend.memory_bytes)
+        audio = np.zeros(3 * main.WHISPER_SAMPLE_RATE, dtype=np.float32)
+
+        with manager.use("tiny") as model:
+            result = backend.transcribe(model, audio)
+            streamed = list(backend.stream_segments(model, audio))
+
+        self.assertEqual(result["text"], " word0 word1 word2")
+        self.assertEqual(result["timings"]["audio"], 3.0)
+        self.assertGreaterEqual(result["timings"]["transcribe"], 0.0)
+        self.assertEqual([s["end"] for s in streamed], [1.0, 2.0, 3.0])
+        self.assertIn("tiny", backend.load_times)
+        self.assertEqual(manager.memory_bytes(), 1024 * 1024)
+
+    def test_backends_must_implement_the_engine_methods(self):
+        """Test that an engine missing run() cannot be instantiated"""
+        class Incomplete(main.ASRBackend):
+            def load_model(self, model_name):
+                return None
+
+        with self.assertRaises(TypeError):
+            Incomplete()
+
+    def test_file_inputs_report_decoded_duration(self):
+        """Test that a path is decoded once and timed by its real length"""
+        import numpy as np
+        backend = FakeBackend()
+        decoded = []
+
+        def decode_audio(path):
+            decoded.append(path)
+            return np.zeros(2 * main.WHISPER_SAMPLE_RATE, dtype=np.float32)
+
+        backend.decode_audio = decode_audio
+        result = backend.transcribe(backend.load_model("tiny"), "clip.mp3")
+        self.assertEqual(decoded, ["clip.mp3"])
+        self.assertEqual(result["timings"]["audio"], 2.0)
+        self.assertEqual(result["text"], " word0 word1")
+
+    def test_faster_whisper_results_use_whisper_shape(self):
+        """Test that faster-whisper segments are converted to Whisper result dicts"""
+        import numpy as np
+
+        class Segment:
+            def __init__(self, i):
+                self.id, self.start, self.end, self.text = i, float(i), i + 1.0, f" part{i}"
+                self.avg_logprob, self.compression_ratio, self.no_speech_prob = -0.2, 1.1, 0.01
+
+        class Info:
+            language = "sv"
+
+        class FakeCT2Model:
+            def transcribe(self, audio, **options):
+                self.options = options
+                return (Segment(i) for i in range(2)), Info()
+
+        backend = main.FasterWhisperBackend("/nonexistent")
+        model = FakeCT2Model()
+        result = backend.transcribe(model, np.zeros(16000, dtype=np.float32),
+                                    fp16=False, temperature=0.0)
+
+        self.assertEqual(result["text"], " part0 part1")
+        self.assertEqual(result["language"], "sv")
+        self.assertEqual(result["segments"][1]["start"], 1.0)
+        self.assertEqual(model.options, {"temperature": 0.0})
+        with self.assertRaises(FileNotFoundError):
+            backend.load("base")
+
+    def test_realtime_profile_decodes_greedily(self):
+        """Test that the realtime profile turns off beam search and temperature fallback"""
+        realtime = main.DECODING_PROFILES["realtime"]
+        self.assertEqual(realtime["temperature"], 0.0)
+        self.assertFalse(realtime["condition_on_previous_text"])
+        self.assertEqual(main.DECODING_PROFILES["accurate"]["beam_size"], 5)
+        self.assertIsNone(main.DECODING_PROFILES["balanced"]["best_of"])
+
+        options = main.FasterWhisperBackend._options(realtime)
+        self.assertEqual(options["beam_size"], 1)
+        self.assertNotIn("best_of", options)
+        self.assertNotIn("fp16", options)
+
+    def test_whisper_backend_converts_once_before_workers_load(self):
+        """Test that prepare() converts a missing model and skips a converted one"""
+        class FakeStore:
+            def __init__(self):
+                self.converted = []
+
+            def has(self, name):
+                return name in self.converted
+
+            def convert(self, name):
+                self.converted.append(name)
+
+        backend = main.WhisperBackend(FakeStore())
+        backend.prepare("base-int8")
+        backend.prepare("base")
+        self.assertEqual(backend.store.converted, ["base"])
+
+    def test_model_keys_name_the_engine(self):
+        """Test that model-manager keys default to the Whisper engine"""
+        self.assertEqual(main.split_model_key("base-int8"), ("whisper", "base-int8"))
+        self.assertEqual(main.split_model_key("faster-whisper:small"), ("faster-whisper", "small"))
+
+    def test_missing_whisper_internals_raise_clearly(self):
+        """Test that a Whisper without the private tables fails with a RuntimeError"""
+        import types
+        whisper_module = types.SimpleNamespace(_MODELS={"tiny": "url"})
+        self.assertEqual(main.whisper_internal(whisper_module, "_MODELS"), {"tiny": "url"})
+        with self.assertRaisesRegex(RuntimeError, "whisper._ALIGNMENT_HEADS"):
+            main.whisper_internal(whisper_module, "_ALIGNMENT_HEADS")
+
+
+@unittest.skipUnless(MAIN_IMPORT_SUCCESS, "main module not importable")
+class TestLanguageTracker(unittest.TestCase):
+    """Test the remembered session language"""
+
+    def test_language_tracker_remembers_and_redetects(self):
+        """Test that the session language is reused until confidence drops"""
+        tracker = main.LanguageTracker()
+        self.assertIsNone(tracker.language())
+
+        good = [{"start": 0.0, "end": 2.0, "avg_logprob": -0.3, "no_speech_prob": 0.01}]
+        tracker.observe({"language": "sv", "segments": good})
+        self.assertEqual(tracker.language(), "sv")
+
+        tracker.observe({"language": "sv", "segments": good}, forced_language="sv")
+        self.assertEqual(tracker.language(), "sv")
+
+        bad = [{"start": 0.0, "end": 2.0, "avg_logprob": -1.6, "no_speech_prob": 0.02},
+               {"start": 2.0, "end": 3.0, "avg_logprob": -0.1, "no_speech_prob": 0.9}]
+        tracker.observe({"language": "sv", "segments": bad}, forced_language="sv")
+        self.assertIsNone(tracker.language())
+
+        tracker.pin("en")
+        tracker.observe({"language": "en", "segments": bad}, forced_language="en")
+        self.assertEqual(tracker.language(), "en")
+
+
+@unittest.skipUnless(MAIN_IMPORT_SUCCESS, "main module not importable")
+class TestTranscriptCaches(unittest.TestCase):
+    """Test the persistent transcript and decoded-audio caches"""
+
+    def test_transcript_cache_single_flight_and_eviction(self):
+        """Test that concurrent requests share one computation and old entries are evicted"""
+        import tempfile
+        import threading
+        import numpy as np
+        with tempfile.TemporaryDirectory() as directory:
+            cache = main.TranscriptCache(os.path.join(directory, "cache", "t.sqlite3"), max_mb=1)
+            audio = np.ones(16000, dtype=np.float32)
+            key = cache.key(cache.audio_digest(audio), "base", {"temperature": (0.0, 0.2)})
+            self.assertNotEqual(key, cache.key(cache.audio_digest(audio * 0.5), "base",
+                                               {"temperature": (0.0, 0.2)}))
+
+            calls = []
+
+            def compute():
+                calls.append(1)
+                return {"text": " hello", "segments": [{"start": 0.0, "end": 1.0}],
+                        "language": "en", "timings": {}}
+
+            threads = [threading.Thread(target=cache.get_or_compute, args=(key, compute))
+                       for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            self.assertEqual(len(calls), 1)
+            self.assertEqual(cache.get(key)["segments"], [{"start": 0.0, "end": 1.0}])
+
+            big = {"text": "x" * (700 * 1024), "segments": []}
+            cache.put("first", big)
+            cache.put("second", big)
+            self.assertIsNone(cache.get("first"))
+            self.assertIsNotNone(cache.get("second"))
+
+    def test_decoded_audio_cache_decodes_once(self):
+        """Test that a file is decoded once and then served memory-mapped"""
+        import tempfile
+        import numpy as np
+        decodes = []
+
+        def decoder(path):
+            decodes.append(path)
+            return np.full(16000, len(decodes), dtype=np.float32)
+
+        with tempfile.TemporaryDirectory() as directory:
+            cache = main.DecodedAudioCache(os.path.join(directory, "decoded"), max_mb=1,
+                                           decoder=decoder)
+            clips = []
+            for name in ("a.mp3", "b.mp3", "c.mp3", "d.mp3", "e.mp3"):
+                clips.append(os.path.join(directory, name))
+                with open(clips[-1], "wb") as f:
+                    f.write(name.encode())
+
+            first = cache.load(clips[0])
+            again = cache.load(clips[0])
+            self.assertEqual(len(decodes), 1)
+            self.assertIsInstance(again, np.memmap)
+            np.testing.assert_array_equal(first, again)
+
+            # 64 KB per entry: the 1 MB bound is never reached, so nothing is evicted
+            for clip in clips[1:]:
+                cache.load(clip)
+            self.assertEqual(len(os.listdir(cache.directory)), 5)
+
+            cache.max_bytes = 200 * 1024
+            cache.load(clips[0])
+            cache._evict(keep=None)
+            remaining = os.listdir(cache.directory)
+            self.assertEqual(len(remaining), 3)
+            self.assertIn(os.path.basename(cache.entry_path(clips[0])), remaining)
+
+
+@unittest.skipUnless(MAIN_IMPORT_SUCCESS, "main module not importable")
+class TestParallelTranscription(unittest.TestCase):
+    """Test chunked transcription of long audio in worker processes"""
+
+    def test_chunks_are_cut_in_pauses(self):
+        """Test that long audio is split at quiet points into padded, owned chunks"""
+        import numpy as np
+        rate = main.WHISPER_SAMPLE_RATE
+        rng = np.random.default_rng(1)
+        audio = (rng.standard_normal(rate * 25) * 0.1).astype(np.float32)
+        audio[int(rate * 9.2):int(rate * 9.6)] = 0.0   # pause shortly before 10 s
+        audio[int(rate * 18.5):int(rate * 18.9)] = 0.0
+
+        chunks = main.plan_chunks(audio, rate, chunk_seconds=10, overlap_seconds=0.5)
+        self.assertEqual(len(chunks), 3)
+        cuts = [own_start for _, _, own_start, _ in chunks[1:]]
+        self.assertTrue(9.2 * rate <= cuts[0] <= 9.6 * rate)
+        self.assertTrue(18.5 * rate <= cuts[1] <= 18.9 * rate)
+        self.assertEqual(chunks[1][0], cuts[0] - rate // 2)
+        self.assertEqual(chunks[-1][3], len(audio))
+
+    def test_stitching_shifts_timestamps_and_drops_overlap(self):
+        """Test that segments in a neighbour's overlap are dropped once shifted"""
+        rate = main.WHISPER_SAMPLE_RATE
+        chunks = [(0, 11 * rate, 0, 10 * rate), (9 * rate, 20 * rate, 10 * rate, 20 * rate)]
+        results = [
+            {"text": " a b", "language": "en",
+             "segments": [{"start": 0.0, "end": 5.0, "text": " a"},
+                          {"start": 8.5, "end": 10.5, "text": " b"}]},
+            {"text": " b c",
+             "segments": [{"start": 0.0, "end": 1.6, "text": " b"},
+                          {"start": 2.0, "end": 6.0, "text": " c"}]},
+        ]
+        result = main.stitch_chunks(chunks, results, rate)
+        self.assertEqual(result["text"], " a b c")
+        self.assertEqual([s["start"] for s in result["segments"]], [0.0, 8.5, 11.0])
+        self.assertEqual(result["language"], "en")
+
+    def test_parallel_transcription_in_worker_processes(self):
+        """Test that chunks transcribed by spawned workers are stitched in order"""
+        import numpy as np
+        rate = main.WHISPER_SAMPLE_RATE
+        audio = np.zeros(rate * 9, dtype=np.float32)
+        chunks = main.plan_chunks(audio, rate, chunk_seconds=3, overlap_seconds=0.0)
+        progress = []
+        backend = FakeBackend()
+        result = main.transcribe_in_parallel(backend, "tiny", audio, chunks, {}, 2, 1,
+                                             on_progress=lambda done, total: progress.append(done))
+        self.assertEqual(backend.prepared, ["tiny"])
+        starts = [s["start"] for s in result["segments"]]
+        self.assertEqual(starts, sorted(starts))
+        self.assertEqual(len(starts), sum((end - start) // rate for start, end, _, _ in chunks))
+        self.assertEqual(progress, list(range(1, len(chunks) + 1)))
+
+
+def _has_module(name):
+    try:
+        __import__(name)
+        return True
+    except ImportError:
+        return False
+
+
+@unittest.skipUnless(MAIN_IMPORT_SUCCESS and _has_module('torch') and _has_module('whisper'),
+                     "torch and whisper required")
+class TestLocalModelStore(unittest.TestCase):
+    """Test converting and memory-map loading a (tiny, randomly initialised) checkpoint"""
+
+    def test_converted_model_matches_original(self):
+        import tempfile
+        import torch
+        from whisper.model import ModelDimensions, Whisper
+        dims = dict(n_mels=80, n_audio_ctx=1500, n_audio_state=64, n_audio_head=2,
+                    n_audio_layer=1, n_vocab=51865, n_text_ctx=448, n_text_state=64,
+                    n_text_head=2, n_text_layer=1)
+        original = Whisper(ModelDimensions(**dims))
+        # Whisper allocates this with torch.empty; it may hold NaN until a checkpoint is loaded
+        torch.nn.init.normal_(original.decoder.positional_embedding)
+        with tempfile.TemporaryDirectory() as directory:
+            checkpoint = os.path.join(directory, "checkpoint.pt")
+            torch.save({"dims": dims, "model_state_dict": original.state_dict()}, checkpoint)
+            store = main.LocalModelStore(os.path.join(directory, "store"))
+            store.convert("custom", checkpoint)
+            self.assertTrue(store.has("custom"))
+
+            model = store.load("custom")
+            mel = torch.randn(1, 80, 3000)
+            tokens = torch.tensor([[50258, 50259]])
+            with torch.no_grad():
+                expected = original.logits(tokens, original.encoder(mel))
+                actual = model.logits(tokens, model.encoder(mel))
+            self.assertTrue(torch.equal(expected, actual))
+            del model
+
+    def test_int8_quantization_replaces_linear_layers(self):
+        """Test dynamic quantization of Whisper's Linear subclass"""
+        import torch
+        from whisper.model import ModelDimensions, Whisper
+        dims = dict(n_mels=80, n_audio_ctx=1500, n_audio_state=64, n_audio_head=2,
+                    n_audio_layer=1, n_vocab=51865, n_text_ctx=448, n_text_state=64,
+                    n_text_head=2, n_text_layer=1)
+        model = Whisper(ModelDimensions(**dims)).eval()
+        mel = torch.randn(1, 80, 3000)
+        with torch.no_grad():
+            expected = model.encoder(mel)
+            quantized = main.quantize_whisper_model(model)
+            actual = quantized.encoder(mel)
+        self.assertFalse(any(isinstance(m, torch.nn.Linear) for m in quantized.modules()))
+        self.assertLess(float((actual - expected).abs().mean()), 0.1)
+
 
 class TestAPIIntegration(unittest.TestCase):
     """Test API integration functionality"""
@@ -96,6 +874,506 @@ class TestAPIIntegration(unittest.TestCase):
         self.assertIn('localhost', default_url,
                      "Default URL should contain localhost")
 
+    @unittest.skipUnless(MAIN_IMPORT_SUCCESS, "main module not importable")
+    def test_client_reuses_connection_and_retries_unavailable(self):
+        """Test keep-alive reuse and retry of a 503 against a local server"""
+        import json
+        import threading
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        seen = []
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                seen.append(("GET", self.client_address[1]))
+                self.reply(200, {"data": []})
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers["Content-Length"]))
+                seen.append(("POST", self.client_address[1]))
+                if len(seen) == 2:
+                    self.reply(503, {"error": "loading model"})
+                else:
+                    self.reply(200, {"choices": [{"message": {"content": "hi"}}]})
+
+            def reply(self, status, body):
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        client = main.LMStudioClient("key", backoff=0.01)
+        try:
+            url = f"http://127.0.0.1:{server.server_port}/v1/chat/completions"
+            self.assertEqual(client.models(url).status_code, 200)
+            response = client.chat(url, {"messages": []})
+            self.assertEqual(response.json()["choices"][0]["message"]["content"], "hi")
+        finally:
+            client.close()
+            server.shutdown()
+            server.server_close()
+
+        self.assertEqual([method for method, _ in seen], ["GET", "POST", "POST"])
+        self.assertEqual(len({port for _, port in seen}), 1)
+
+    @unittest.skipUnless(MAIN_IMPORT_SUCCESS, "main module not importable")
+    def test_cancelling_a_chat_job_closes_the_stream(self):
+        """Test that cancelling a streaming request disconnects from the server"""
+        import json
+        import queue
+        import threading
+        import time
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        disconnected = threading.Event()
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers["Content-Length"]))
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                try:
+                    for _ in range(100):
+                        event = ("data: " + json.dumps({"choices": [{"delta": {"content": "x"}}]})
+                                 + "\n\n").encode()
+                        self.wfile.write(b"%x\r\n%s\r\n" % (len(event), event))
+                        self.wfile.flush()
+                        time.sleep(0.05)
+                except OSError:
+                    disconnected.set()
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        client = main.LMStudioClient("key")
+        background = main.BackgroundLoop(queue.Queue().put)
+        tokens = queue.Queue()
+        finished = threading.Event()
+
+        def chat(job):
+            try:
+                response = client.chat(f"http://127.0.0.1:{server.server_port}/", {})
+                job.on_cancel(response.close)
+                for delta in main.iter_sse_deltas(response.iter_lines(chunk_size=None)):
+                    tokens.put(delta)
+            finally:
+                finished.set()
+
+        try:
+            background.submit("chat", chat)
+            for _ in range(3):
+                tokens.get(timeout=5)
+            background.cancel_lane("chat")
+            self.assertTrue(finished.wait(2))
+            self.assertTrue(disconnected.wait(2))
+        finally:
+            background.close()
+            client.close()
+            server.shutdown()
+            server.server_close()
+
+    @unittest.skipUnless(MAIN_IMPORT_SUCCESS, "main module not importable")
+    def test_context_builder_folds_old_turns_into_summary(self):
+        """Test that long chats stay within the budget using a rolling summary"""
+        counted = []
+
+        def words(text):
+            counted.append(text)
+            return len(text.split())
+
+        summaries = []
+
+        def summarize(job, turns, previous, max_tokens):
+            summaries.append(len(turns))
+            return f"{previous} +{len(turns)} turns".strip()
+
+        builder = main.ContextBuilder(context_tokens=300, reply_tokens=100, tokenizer=words,
+                                      summarize=summarize, summary_tokens=20, message_overhead=0)
+        history = []
+        for turn in range(20):
+            messages = builder.build("system rules", history, f"question {turn} " + "word " * 8)
+            self.assertLessEqual(sum(len(m["content"].split()) for m in messages),
+                                 builder.prompt_budget)
+            history += [messages[-1], {"role": "assistant", "content": "answer " * 10}]
+
+        self.assertTrue(summaries)
+        self.assertLess(len(summaries), 10)  # folds in batches, not every turn
+        self.assertIn("SUMMARY OF THE EARLIER CONVERSATION", messages[0]["content"])
+        self.assertEqual(messages[-1]["content"].split()[:2], ["question", "19"])
+        self.assertEqual(builder.summarized % 2, 0)
+
+        # Cached counts: a message text is tokenized once, not once per turn
+        self.assertEqual(counted.count("answer " * 10), 1)
+
+    @unittest.skipUnless(MAIN_IMPORT_SUCCESS, "main module not importable")
+    def test_context_builder_shortens_a_long_message(self):
+        """Test that a pasted transcript cannot push the request past the budget"""
+        builder = main.ContextBuilder(context_tokens=1000, reply_tokens=200)
+        transcript = " ".join(f"word{i}" for i in range(5000))
+        system_prompt = builder.fit_text(transcript, builder.prompt_budget // 2)
+        messages = builder.build(system_prompt, [], transcript)
+        self.assertIn("[...]", messages[-1]["content"])
+        self.assertLessEqual(sum(builder.message_tokens(m) for m in messages),
+                             builder.prompt_budget)
+
+    @unittest.skipUnless(MAIN_IMPORT_SUCCESS, "main module not importable")
+    def test_cancelled_summary_is_not_committed(self):
+        """Test that a summary aborted with its job is retried instead of kept as an excerpt"""
+        import types
+        calls = []
+
+        def summarize(job, turns, previous, max_tokens):
+            calls.append(job)
+            if job is not None and job.cancelled:
+                raise ConnectionError("connection closed")
+            return "real summary"
+
+        builder = main.ContextBuilder(context_tokens=200, reply_tokens=50, summarize=summarize,
+                                      summary_tokens=30)
+        history = [{"role": "user", "content": "question " * 20},
+                   {"role": "assistant", "content": "answer " * 20}] * 4
+        with self.assertRaises(ConnectionError):
+            builder.build(None, history, "next", types.SimpleNamespace(cancelled=True))
+        self.assertEqual((builder.summary, builder.summarized), ("", 0))
+
+        messages = builder.build(None, history, "next")
+        self.assertEqual(len(calls), 2)
+        self.assertIn("real summary", messages[0]["content"])
+
+    @unittest.skipUnless(MAIN_IMPORT_SUCCESS, "main module not importable")
+    def test_context_builder_falls_back_to_excerpts(self):
+        """Test summarizer failures and text shortening"""
+        def failing(job, turns, previous, max_tokens):
+            raise RuntimeError("server busy")
+
+        builder = main.ContextBuilder(context_tokens=200, reply_tokens=50, summarize=failing,
+                                      summary_tokens=30)
+        history = [{"role": "user", "content": "first question " * 20},
+                   {"role": "assistant", "content": "first answer " * 20}] * 4
+        messages = builder.build(None, history, "next")
+        self.assertIn("user: first question", messages[0]["content"])
+        self.assertLessEqual(sum(main.estimate_tokens(m["content"]) + 4 for m in messages),
+                             builder.prompt_budget)
+
+        long_text = "start " + "filler " * 1000 + "end"
+        short = builder.fit_text(long_text, 100)
+        self.assertLessEqual(main.estimate_tokens(short), 100)
+        self.assertTrue(short.startswith("start") and short.endswith("end"))
+
+    @unittest.skipUnless(MAIN_IMPORT_SUCCESS, "main module not importable")
+    def test_sse_stream_parsing(self):
+        """Test that content deltas are read from an OpenAI-style event stream"""
+        lines = [
+            b'data: {"choices": [{"delta": {"role": "assistant"}}]}',
+            b'',
+            'data: {"choices": [{"delta": {"content": "Hej "}}]}'.encode(),
+            b': keep-alive',
+            'data: {"choices": [{"delta": {"content": "v\u00e4rlden"}}]}'.encode(),
+            b'data: [DONE]',
+            b'data: {"choices": [{"delta": {"content": "ignored"}}]}',
+        ]
+        self.assertEqual(list(main.iter_sse_deltas(lines)), ["Hej ", "v\u00e4rlden"])
+        with self.assertRaises(RuntimeError):
+            list(main.iter_sse_deltas([b'data: {"error": "model crashed"}']))
+
+    @unittest.skipUnless(MAIN_IMPORT_SUCCESS, "main module not importable")
+    def test_token_batcher_schedules_one_flush_per_batch(self):
+        """Test that tokens arriving between UI flushes are rendered together"""
+        scheduled = []
+        rendered = []
+        batcher = main.TokenBatcher(rendered.append, lambda ms, callback: scheduled.append(callback))
+        for token in ["Hel", "lo", " there"]:
+            batcher.add(token)
+        self.assertEqual(len(scheduled), 1)
+        scheduled.pop()()
+        batcher.add("!")
+        scheduled.pop()()
+        self.assertEqual(rendered, ["Hello there", "!"])
+
+
+class FakeVar:
+    """Stand-in for a Tk variable"""
+
+    def __init__(self, value=None):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+    def set(self, value):
+        self.value = value
+
+
+class FakeWidget:
+    """Stand-in for a Tk widget that ignores configuration"""
+
+    def config(self, **options):
+        pass
+
+
+class FakeChatResponse:
+    """Non-streamed LM Studio answer"""
+
+    status_code = 200
+    headers = {"Content-Type": "application/json"}
+
+    def __init__(self, content):
+        self.content = content
+
+    def json(self):
+        return {"choices": [{"message": {"content": self.content}}]}
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+@unittest.skipUnless(MAIN_IMPORT_SUCCESS, "main module not importable")
+class TestAppJobs(unittest.TestCase):
+    """Test the app's background jobs on an assistant without a window
+
+    Callbacks the app would hand to the Tk loop are queued and run by pump().
+    """
+
+    def setUp(self):
+        import queue
+        import types
+        self.callbacks = queue.Queue()
+        app = main.AIVoiceAssistant.__new__(main.AIVoiceAssistant)
+        app.root = types.SimpleNamespace(after=lambda ms, callback: self.callbacks.put(callback))
+        app.background = main.BackgroundLoop(self.callbacks.put, max_concurrency=3)
+        app.status_var = FakeVar("")
+        app.transcribe_button = FakeWidget()
+        app.chat_messages = []
+        app.add_to_chat = lambda message, sender_type: app.chat_messages.append(message)
+        self.app = app
+
+    def tearDown(self):
+        self.app.background.close()
+
+    def pump(self, done, timeout=5):
+        """Run queued Tk callbacks until done() is true"""
+        import queue
+        import time
+        deadline = time.monotonic() + timeout
+        while not done():
+            try:
+                self.callbacks.get(timeout=max(0.0, deadline - time.monotonic()))()
+            except queue.Empty:
+                self.fail("timed out waiting for background jobs")
+
+    def prepare_chat(self):
+        import types
+        app = self.app
+        app.conversation_history = []
+        app.context_generation = app.history_generation = 0
+        app.current_transcription = ""
+        app.supersede_responses = True
+        app.stream_responses = False
+        app.lm_studio_url = "http://localhost:1234/v1/chat/completions"
+        app.context_builder = main.ContextBuilder(context_tokens=8192, reply_tokens=1500)
+        app.lm_client = types.SimpleNamespace(chat=lambda url, data: FakeChatResponse(
+            f"re: {data['messages'][-1]['content']}"))
+
+    def test_transcription_uses_audio_captured_at_submit(self):
+        """Test that a queued transcription ignores audio and settings changed later"""
+        import threading
+        import numpy as np
+        app = self.app
+        rate = main.WHISPER_SAMPLE_RATE
+        heard = []
+        transcripts = []
+        app.model_loaded = True
+        app.long_recording = None
+        app.audio_array = np.zeros(2 * rate, dtype=np.float32)
+        app.trim_silence_var = FakeVar(False)
+        app.profile_var = FakeVar("balanced")
+        app.selected_model_name = lambda: "tiny"
+        app.parallel_workers = 1
+        app.parallel_min_seconds = 600
+        app.handle_transcription = transcripts.append
+
+        def transcribe_audio(audio, model_name, profile, **options):
+            heard.append((len(audio), model_name, profile))
+            return {"text": " hello ", "segments": []}
+
+        app.transcribe_audio = transcribe_audio
+
+        release = threading.Event()
+        app.background.submit("transcribe", lambda job: release.wait(5))
+        app.transcribe_and_send()
+        app.audio_array = np.zeros(5 * rate, dtype=np.float32)
+        app.trim_silence_var.set(True)
+        app.profile_var.set("accurate")
+        release.set()
+
+        self.pump(lambda: transcripts)
+        self.assertEqual(heard, [(2 * rate, "tiny", "balanced")])
+        self.assertEqual(transcripts, ["hello"])
+        self.assertEqual(app.status_var.get(), "🎯 Transcribing audio...")
+
+    def test_worker_status_updates_run_on_the_tk_thread(self):
+        """Test that progress reported from a job is applied by a Tk callback"""
+        import threading
+        app = self.app
+        app.status_var = FakeVar("")
+        applied_on = []
+        app.status_var.set = lambda value: applied_on.append(threading.current_thread())
+        app.background.submit("transcribe", lambda job: app.post_status("🎯 Transcribing 1/3 min..."))
+        self.pump(lambda: applied_on)
+        self.assertIs(applied_on[0], threading.main_thread())
+
+    def test_wav_copies_are_kept_in_the_recordings_folder(self):
+        """Test that a kept WAV copy lands in the recordings folder, not a temp file"""
+        import tempfile
+        import types
+        import wave
+        app = self.app
+        app.p = types.SimpleNamespace(get_sample_size=lambda format: 2)
+        app.channels, app.rate, app.format = 1, main.WHISPER_SAMPLE_RATE, main.PA_INT16
+        with tempfile.TemporaryDirectory() as directory:
+            app.recordings_dir = os.path.join(directory, "recordings")
+            app.write_wav_copy(b"\x01\x00" * 1600)
+            (name,) = os.listdir(app.recordings_dir)
+            with wave.open(os.path.join(app.recordings_dir, name), "rb") as wf:
+                self.assertEqual(wf.getnframes(), 1600)
+            self.pump(lambda: app.status_var.get())
+            self.assertIn(name, app.status_var.get())
+            self.assertFalse(hasattr(app, "temp_audio_file"))
+        app.p = None
+
+    def test_parallel_chunks_share_one_detected_language(self):
+        """Test that the language is detected once before chunks go to the workers"""
+        from unittest import mock
+        import numpy as np
+        app = self.app
+        rate = main.WHISPER_SAMPLE_RATE
+        app.language_tracker = main.LanguageTracker()
+        app.parallel_chunk_seconds = 10
+        app.parallel_workers = 2
+        app.parallel_threads_per_worker = 1
+        app.asr_backends = {"whisper": None}
+        probes = []
+
+        def run_transcription(audio, model_name, options):
+            probes.append((len(audio), options["language"]))
+            return {"text": "", "segments": [], "language": "sv"}
+
+        app.run_transcription = run_transcription
+        stitched = {"text": "", "segments": [], "language": "sv"}
+        with mock.patch.object(main, "transcribe_in_parallel", return_value=stitched) as parallel:
+            app.run_parallel_transcription(np.zeros(45 * rate, dtype=np.float32), "base",
+                                           {"language": None})
+        self.assertEqual(probes, [(30 * rate, None)])
+        self.assertEqual(parallel.call_args[0][4]["language"], "sv")
+
+    def test_failed_subsystem_is_not_reported_as_ready(self):
+        """Test that a startup failure stays in the status bar after the last subsystem"""
+        app = self.app
+        app.startup = main.StartupTimer()
+        app.pending_subsystems = {"audio", "whisper"}
+        app.failed_subsystems = {}
+        app.subsystem_ready("audio")
+        app.subsystem_ready("whisper", "model file missing")
+        self.assertTrue(app.status_var.get().startswith("❌ Startup failed (whisper: model file missing)"))
+        self.assertIn("startup:", app.status_var.get())
+
+    def test_stopping_an_empty_disk_recording_removes_its_file(self):
+        """Test that a disk recording stopped before any audio leaves no WAV behind"""
+        import tempfile
+        app = self.app
+        app.is_recording = True
+        app.continuous_mode = False
+        app.capture_engine = None
+        app.streaming_transcriber = None
+        app.update_level_meter = lambda blocks: None
+        app.record_button = app.recording_status = FakeWidget()
+        app.colors = {"success": "green"}
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "recording.wav")
+            app.capture_buffer = main.SpillingCaptureBuffer(path, main.WHISPER_SAMPLE_RATE)
+            app.stop_recording()
+            self.assertTrue(app.capture_buffer.closed)
+            self.assertFalse(os.path.exists(path))
+
+    def test_new_transcript_resets_history_on_the_chat_lane(self):
+        """Test that loading a transcript leaves the history to the next chat job"""
+        app = self.app
+        self.prepare_chat()
+        app.conversation_history = [{"role": "user", "content": "old"},
+                                    {"role": "assistant", "content": "answer"}]
+        app.current_transcription = "a new transcript"
+        app.add_transcription_to_context()
+        self.assertEqual(len(app.conversation_history), 2)
+
+        app.get_ai_response("first question")
+        self.pump(lambda: app.status_var.get().startswith("✅"))
+        self.assertEqual([m["content"] for m in app.conversation_history],
+                         ["first question", "re: first question"])
+
+    def test_voice_messages_queue_instead_of_superseding(self):
+        """Test that two hands-free utterances in a row are both answered"""
+        import threading
+        app = self.app
+        self.prepare_chat()
+        release = threading.Event()
+        app.background.submit("chat", lambda job: release.wait(5))
+        app.send_voice_message("one")
+        app.send_voice_message("two")
+        release.set()
+
+        self.pump(lambda: len(app.conversation_history) == 4)
+        self.assertEqual([m["content"] for m in app.conversation_history],
+                         ["one", "re: one", "two", "re: two"])
+        self.assertNotIn("superseded", app.status_var.get())
+
+    def test_cancelling_a_chat_job_closes_its_summary_request(self):
+        """Test that a summary written for a cancelled request is aborted"""
+        import threading
+        import types
+        app = self.app
+        self.prepare_chat()
+        started = threading.Event()
+
+        class BlockingResponse(FakeChatResponse):
+            def __init__(self):
+                super().__init__("summary")
+                self.closed = threading.Event()
+
+            def json(self):
+                started.set()
+                self.closed.wait(5)
+                raise ConnectionError("connection closed")
+
+            def close(self):
+                self.closed.set()
+
+        response = BlockingResponse()
+        app.lm_client = types.SimpleNamespace(chat=lambda url, data: response)
+        turns = [{"role": "user", "content": "question"}, {"role": "assistant", "content": "answer"}]
+        app.background.submit("chat", app.summarize_turns, turns, "", 50)
+        self.assertTrue(started.wait(5))
+        app.background.cancel_lane("chat")
+        self.assertTrue(response.closed.wait(2))
+
 
 if __name__ == '__main__':
     # Run tests with verbose output